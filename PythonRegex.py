@@ -1,40 +1,15 @@
+import io
+import os
+import zipfile
 import streamlit as st
-import re
-import base64
+import assets
+import format_batch
+import profiling
+import text_formatter
 
-# Function to load the image and convert it to base64
-def get_base64_of_bin_file(bin_file):
-    with open(bin_file, 'rb') as f:
-        data = f.read()
-    return base64.b64encode(data).decode()
+# QR code in the top-right corner, served by URL and cached across reruns
+assets.show_qr_code()
 
-# Path to the locally stored QR code image
-qr_code_path = "qrcode.png"  # Ensure the image is in your app directory
-
-# Convert image to base64
-qr_code_base64 = get_base64_of_bin_file(qr_code_path)
-
-# Custom CSS to position the QR code close to the top-right corner under the "Deploy" area
-st.markdown(
-    f"""
-    <style>
-    .qr-code {{
-        position: fixed;  /* Keeps the QR code fixed in the viewport */
-        top: 10px;       /* Sets the distance from the top of the viewport */
-        right: 10px;     /* Sets the distance from the right of the viewport */
-        width: 200px;    /* Adjusts the width of the QR code */
-        z-index: 100;    /* Ensures the QR code stays above other elements */
-    }}
-    </style>
-    <img src="data:image/png;base64,{qr_code_base64}" class="qr-code">
-    """,
-    unsafe_allow_html=True
-)
-
-
-# Regular expressions to match headers and section headers
-header_pattern = re.compile(r'^\[(.*?)\]$')  # Matches text wrapped in []
-section_header_pattern = re.compile(r'^\{(.*?)\}$')  # Matches text wrapped in {}
 
 # Streamlit app title
 st.title("Customizable Header and Section Header Formatter")
@@ -59,26 +34,51 @@ paragraph_font_size = st.sidebar.selectbox("Select paragraph font size:", ["14px
 paragraph_font_family = st.sidebar.selectbox("Select paragraph font family:", ["Arial", "Courier New", "Georgia", "Times New Roman"])
 paragraph_font_color = st.sidebar.color_picker("Select paragraph font color:", "#000000")
 
-# Function to format the output
+# One <style> block with classes keeps the output far smaller than inline styles
+output_mode = st.sidebar.selectbox("Style the output with:", ["CSS classes", "Inline styles"])
+
+# Function to format the output, one chunk of HTML per block of lines. Each line is
+# classified once by text_formatter, and blocks that haven't changed since an earlier
+# rerun are reused rather than formatted again
+def format_output_chunks(text):
+    return text_formatter.iter_html(
+        text,
+        text_formatter.TextStyle(header_font_size, header_font_family, header_font_color),
+        text_formatter.TextStyle(section_header_font_size, section_header_font_family, section_header_font_color),
+        text_formatter.TextStyle(paragraph_font_size, paragraph_font_family, paragraph_font_color),
+        text_formatter.CLASSES if output_mode == "CSS classes" else text_formatter.INLINE,
+    )
+
+# Function to format the output as a single HTML string
 def format_output(text):
-    formatted_lines = []
-    for line in text.splitlines():
-        # Check if the line matches the header pattern
-        if header_pattern.match(line):
-            header_text = header_pattern.match(line).group(1)  # Extract the text within brackets
-            formatted_lines.append(f"<h1 style='color: {header_font_color}; font-family: {header_font_family}; font-size: {header_font_size};'>{header_text}</h1>")
-        # Check if the line matches the section header pattern
-        elif section_header_pattern.match(line):
-            section_header_text = section_header_pattern.match(line).group(1)  # Extract the text within braces
-            formatted_lines.append(f"<h2 style='color: {section_header_font_color}; font-family: {section_header_font_family}; font-size: {section_header_font_size};'>{section_header_text}</h2>")
-        elif line.strip():  # Check if line is not empty
-            formatted_lines.append(f"<p style='color: {paragraph_font_color}; font-family: {paragraph_font_family}; font-size: {paragraph_font_size};'>{line.strip()}</p>")  # Treat plain text as paragraph
-    return "\n".join(formatted_lines)
+    return "\n".join(format_output_chunks(text))
 
 # Display button to show formatted output
 if st.button("Format Text"):
-    # Format the input text
-    formatted_text = format_output(user_input)
-    
-    # Display the formatted output in the Streamlit app
-    st.markdown(formatted_text, unsafe_allow_html=True)
+    # Display the formatted output block by block, so the first blocks show up
+    # while the rest of a large document is still being formatted. Formatting
+    # is timed as text_formatter.format_block, so only the display is timed here.
+    for formatted_chunk in format_output_chunks(user_input):
+        with profiling.span("PythonRegex.markdown"):
+            st.markdown(formatted_chunk, unsafe_allow_html=True)
+
+# Upload mode: convert whole text files with the same settings and download the pages.
+# For large corpora, use the command line instead: python format_batch.py --help
+uploaded_files = st.file_uploader("Or upload text files to convert to HTML:", type=["txt"], accept_multiple_files=True)
+
+if uploaded_files and st.button("Convert Files"):
+    archive = io.BytesIO()
+    converted = 0
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as bundle:
+        for uploaded_file in uploaded_files:
+            # A file that can't be read is reported and skipped; the rest are still converted
+            try:
+                text = uploaded_file.getvalue().decode("utf-8")
+            except UnicodeDecodeError:
+                st.error(f"{uploaded_file.name}: not a UTF-8 text file.")
+                continue
+            page = format_batch.html_document(format_output(text))
+            bundle.writestr(os.path.splitext(uploaded_file.name)[0] + ".html", page)
+            converted += 1
+    if converted:
+        st.download_button("Download HTML files", archive.getvalue(), "formatted.zip", "application/zip")
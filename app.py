@@ -1,16 +1,9 @@
 import streamlit as st
-import home
-import about
-import contact
+import page_registry
 
 # Sidebar for navigation
 st.sidebar.title("Navigation")
-page = st.sidebar.selectbox("Choose a page", ["Home", "About", "Contact"])
+page = st.sidebar.selectbox("Choose a page", page_registry.titles())
 
-# Navigation logic
-if page == "Home":
-    home.app()
-elif page == "About":
-    about.app()
-elif page == "Contact":
-    contact.app()
+# Navigation logic: each page is imported (or compiled) the first time it is shown
+page_registry.show(page)
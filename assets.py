@@ -0,0 +1,119 @@
+import base64
+import hashlib
+import mimetypes
+import os
+import threading
+
+import streamlit as st
+
+# Directory holding the page scripts; assets are resolved relative to it so
+# pages work no matter which directory streamlit is started from
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(APP_DIR, "static")
+
+# Process-wide cache: absolute path -> (mtime_ns, size, content, digest).
+# Reruns hit this instead of the filesystem; an mtime or size change on disk
+# invalidates the entry.
+_files = {}
+# Derived encodings (data URIs, decoded text) keyed by content digest
+_encoded = {}
+_lock = threading.Lock()
+
+
+def _resolve(path):
+    if os.path.isabs(path):
+        return path
+    static_path = os.path.join(STATIC_DIR, path)
+    if os.path.exists(static_path):
+        return static_path
+    return os.path.join(APP_DIR, path)
+
+
+def _load(path):
+    path = _resolve(path)
+    stat = os.stat(path)
+    entry = _files.get(path)
+    if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+        with open(path, 'rb') as f:
+            content = f.read()
+        entry = (stat.st_mtime_ns, stat.st_size, content, hashlib.sha256(content).hexdigest())
+        with _lock:
+            _files[path] = entry
+    return path, entry
+
+
+def read_bytes(path):
+    return _load(path)[1][2]
+
+
+def content_hash(path):
+    """SHA-256 hex digest of the current file contents."""
+    return _load(path)[1][3]
+
+
+def read_text(path, encoding="utf-8"):
+    _, (_, _, content, digest) = _load(path)
+    key = ("text", digest, encoding)
+    text = _encoded.get(key)
+    if text is None:
+        # Same newline handling as open() in text mode
+        text = content.decode(encoding).replace("\r\n", "\n")
+        with _lock:
+            _encoded[key] = text
+    return text
+
+
+def data_uri(path):
+    """Inline ``data:`` URI for the file, base64-encoded once per content version."""
+    resolved, (_, _, content, digest) = _load(path)
+    key = ("data-uri", digest)
+    uri = _encoded.get(key)
+    if uri is None:
+        mime = mimetypes.guess_type(resolved)[0] or "application/octet-stream"
+        uri = f"data:{mime};base64,{base64.b64encode(content).decode()}"
+        with _lock:
+            _encoded[key] = uri
+    return uri
+
+
+def static_serving_enabled():
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def asset_url(name, static=None):
+    """URL for an asset in ``static/``.
+
+    Uses Streamlit's static file serving when it is enabled (see
+    .streamlit/config.toml), with the content hash as a cache-busting query
+    string, and falls back to an inline data URI otherwise.
+    """
+    if static is None:
+        static = static_serving_enabled()
+    if static and os.path.exists(os.path.join(STATIC_DIR, name)):
+        return f"app/static/{name}?v={content_hash(name)[:12]}"
+    return data_uri(name)
+
+
+# Custom CSS to position the QR code close to the top-right corner under the "Deploy" area
+QR_CODE_STYLE = """
+    <style>
+    .qr-code {
+        position: fixed;  /* Keeps the QR code fixed in the viewport */
+        top: 10px;       /* Sets the distance from the top of the viewport */
+        right: 10px;     /* Sets the distance from the right of the viewport */
+        width: 200px;    /* Adjusts the width of the QR code */
+        z-index: 100;    /* Ensures the QR code stays above other elements */
+    }
+    </style>
+"""
+
+
+def qr_code_html(static=None):
+    return f'{QR_CODE_STYLE}    <img src="{asset_url("qrcode.png", static)}" class="qr-code">\n    '
+
+
+def show_qr_code():
+    st.markdown(qr_code_html(), unsafe_allow_html=True)
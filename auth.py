@@ -1,102 +1,36 @@
 import streamlit as st
-import hashlib
+import math
+import secrets
 import sqlite3
 import pandas as pd
-import base64
-
-
-# Function to load the image and convert it to base64
-def get_base64_of_bin_file(bin_file):
-    with open(bin_file, 'rb') as f:
-        data = f.read()
-    return base64.b64encode(data).decode()
-
-# Path to the locally stored QR code image
-qr_code_path = "qrcode.png"  # Ensure the image is in your app directory
-
-# Convert image to base64
-qr_code_base64 = get_base64_of_bin_file(qr_code_path)
-
-# Custom CSS to position the QR code close to the top-right corner under the "Deploy" area
-st.markdown(
-    f"""
-    <style>
-    .qr-code {{
-        position: fixed;  /* Keeps the QR code fixed in the viewport */
-        top: 10px;       /* Sets the distance from the top of the viewport */
-        right: 10px;     /* Sets the distance from the right of the viewport */
-        width: 200px;    /* Adjusts the width of the QR code */
-        z-index: 100;    /* Ensures the QR code stays above other elements */
-    }}
-    </style>
-    <img src="data:image/png;base64,{qr_code_base64}" class="qr-code">
-    """,
-    unsafe_allow_html=True
-)
-
-
-# Function to check if a column exists in a table
-def column_exists(cursor, table_name, column_name):
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    columns = cursor.fetchall()
-    return any(column[1] == column_name for column in columns)
-
-# Database initialization with schema update handling
+import assets
+import user_store
+import password_hashing
+import profiling
+import rate_limit
+import session_store
+
+
+# QR code in the top-right corner, served by URL and cached across reruns
+assets.show_qr_code()
+
+
+# Database initialization; schema migrations run once per process
 def init_db():
     try:
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
-        
-        # Check if the users table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-        table_exists = cursor.fetchone() is not None
-        
-        if not table_exists:
-            # Create new table with all columns
-            cursor.execute('''CREATE TABLE users (
-                            username TEXT PRIMARY KEY,
-                            password TEXT NOT NULL,
-                            role TEXT DEFAULT 'user')''')
-        else:
-            # Check if role column exists
-            if not column_exists(cursor, 'users', 'role'):
-                # Add role column to existing table
-                cursor.execute("ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'user'")
-                conn.commit()
-        
-        # Check if admin account exists
-        cursor.execute("SELECT username FROM users WHERE username = ?", ("admin",))
-        admin_exists = cursor.fetchone()
-        
-        # Create admin account if it doesn't exist
-        if not admin_exists:
-            admin_username = "admin"
-            admin_password = hash_password("admin123")
-            cursor.execute("INSERT INTO users (username, password, role) VALUES (?, ?, ?)",
-                         (admin_username, admin_password, "admin"))
-        else:
-            # Update existing admin account to ensure it has admin role
-            cursor.execute("UPDATE users SET role = ? WHERE username = ?", ("admin", "admin"))
-        
-        conn.commit()
-        conn.close()
+        user_store.ensure_schema()
     except sqlite3.Error as e:
         st.error(f"Database error: {e}")
     except Exception as e:
         st.error(f"An error occurred: {e}")
 
-# Function to hash passwords
+# Function to hash passwords (salted scrypt, computed on the hashing pool)
 def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+    return password_hashing.hash_password(password)
 
 def add_user_to_db(username, password, role='user'):
     try:
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO users (username, password, role) VALUES (?, ?, ?)", 
-                      (username, password, role))
-        conn.commit()
-        conn.close()
+        user_store.add_user(username, password, role)
         return True
     except sqlite3.IntegrityError:
         st.error("Username already exists.")
@@ -107,45 +41,70 @@ def add_user_to_db(username, password, role='user'):
 
 def check_user_in_db(username):
     try:
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
-        cursor.execute("SELECT username FROM users WHERE username = ?", (username,))
-        result = cursor.fetchone()
-        conn.close()
-        return result is not None
+        return user_store.user_exists(username)
     except sqlite3.Error as e:
         st.error(f"Database error: {e}")
         return False
 
+@profiling.timed("auth.verify_user")
 def verify_user(username, password):
     try:
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
-        cursor.execute("SELECT password, role FROM users WHERE username = ?", (username,))
-        result = cursor.fetchone()
-        conn.close()
-        
+        result = user_store.get_credentials(username)
+
         if result:
             stored_hashed_password, role = result
-            if stored_hashed_password == hash_password(password):
+            if password_hashing.verify_password(password, stored_hashed_password):
+                # Upgrade legacy or under-cost hashes now that we know the password
+                if password_hashing.needs_rehash(stored_hashed_password):
+                    try:
+                        user_store.update_password(username, hash_password(password))
+                    except sqlite3.Error:
+                        pass  # The old hash still verifies; retry on the next login
                 return True, role
         return False, None
     except sqlite3.Error as e:
         st.error(f"Database error: {e}")
         return False, None
 
-def fetch_all_users_with_passwords():
+def fetch_user_page(after=None, limit=50, search="", role=None, sort="username", descending=False):
     try:
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
-        cursor.execute("SELECT username, password, role FROM users")
-        users = cursor.fetchall()
-        conn.close()
-        return users
+        return user_store.fetch_users_page(after, limit, search, role, sort, descending)
     except sqlite3.Error as e:
         st.error(f"Database error: {e}")
         return []
 
+# Key for this browser session's login rate limit
+def session_key():
+    if 'session_key' not in st.session_state:
+        st.session_state['session_key'] = secrets.token_hex(16)
+    return st.session_state['session_key']
+
+# Start a server-side session. Its id is kept in this browser session's state
+# only, never in the URL; a page reload starts a new browser session and logs
+# the user out.
+def start_session(username, role):
+    st.session_state['session_id'] = session_store.get_store().create(username, role)
+
+# Check the session on every rerun, so role changes, deleted users and ended
+# sessions take effect without another login
+def restore_session():
+    session_id = st.session_state.get('session_id')
+    if not session_id:
+        return
+    try:
+        identity = session_store.get_store().lookup(session_id)
+    except sqlite3.Error as e:
+        st.error(f"Database error: {e}")
+        return
+    if identity is None:
+        # Expired or revoked: forget it
+        for key in ['logged_in', 'username', 'role', 'session_id']:
+            st.session_state.pop(key, None)
+        return
+    st.session_state['logged_in'] = True
+    st.session_state['username'], st.session_state['role'] = identity
+    st.session_state.setdefault('current_page', "Member Dashboard")
+
 def signup():
     st.title("Member Sign-Up")
     
@@ -170,6 +129,7 @@ def signup():
                 st.session_state['logged_in'] = True  # Log the user in
                 st.session_state['username'] = new_username  # Set the username for session state
                 st.session_state['role'] = 'user'  # Set the role
+                start_session(new_username, 'user')
                 st.session_state['current_page'] = "Member Dashboard"  # Redirect to member dashboard
 
                 # Display the "Go" button
@@ -189,12 +149,17 @@ def login():
     if st.button(login_button_label, key="login"):
         if not username or not password:
             st.error("Please enter both username and password.")
+        elif (retry_after := rate_limit.get_throttle().check(username, session_key())):
+            # Throttled in memory, before any database read or password hash
+            st.error(f"Too many login attempts. Please try again in {math.ceil(retry_after)} seconds.")
         else:
             is_valid, role = verify_user(username, password)
             if is_valid:
+                rate_limit.get_throttle().succeeded(username)
                 st.session_state['logged_in'] = True
                 st.session_state['username'] = username
                 st.session_state['role'] = role
+                start_session(username, role)
                 
                 # Redirect based on user role
                 if role == 'admin':
@@ -204,6 +169,7 @@ def login():
                     st.success(f"Welcome {username}!")
                     st.session_state['current_page'] = "Member Dashboard"  # Redirect to member dashboard
             else:
+                rate_limit.get_throttle().failed(username)
                 st.error("Invalid username or password")
 
     # Show the "Go" button for both admin and normal users after successful login
@@ -217,9 +183,14 @@ def login():
                 st.session_state['current_page'] = "Member Dashboard"  # Redirect to member dashboard
 
 def logout():
+    # End the server-side session
+    session_id = st.session_state.get('session_id')
+    if session_id:
+        session_store.get_store().revoke(session_id)
+
     # Clear all session state related to login
     for key in list(st.session_state.keys()):
-        if key in ['logged_in', 'username', 'role', 'current_page']:
+        if key in ['logged_in', 'username', 'role', 'current_page', 'session_id']:
             del st.session_state[key]
     st.success("Logged out successfully!")
     st.session_state['current_page'] = "Login"  # Redirect to login page
@@ -243,14 +214,46 @@ def view_user_data():
         return
 
     st.title("User Data")
-    user_data = fetch_all_users_with_passwords()
-    df = pd.DataFrame(user_data, columns=["Username", "Password", "Role"])
+
+    # Search and sort run in SQLite; only one page of rows is ever loaded
+    search = st.text_input("Search username", key="user_search").strip()
+    role_filter = st.selectbox("Role", ["All", "admin", "user"], key="user_role_filter")
+    sort = st.selectbox("Sort by", ["username", "role"], key="user_sort")
+    descending = st.checkbox("Descending", key="user_sort_desc")
+    page_size = st.selectbox("Rows per page", [25, 50, 100, 500], index=1, key="user_page_size")
+    role = None if role_filter == "All" else role_filter
+
+    # Keyset cursors of the pages visited so far; reset when the query changes
+    query = (search, role, sort, descending, page_size)
+    if st.session_state.get('user_page_query') != query:
+        st.session_state['user_page_query'] = query
+        st.session_state['user_page_cursors'] = [None]
+    cursors = st.session_state['user_page_cursors']
+
+    # Fetch one extra row to know whether a next page exists
+    rows = fetch_user_page(cursors[-1], page_size + 1, search, role, sort, descending)
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+
+    df = pd.DataFrame(rows, columns=["Username", "Role"])
     st.dataframe(df)
 
+    col_prev, col_page, col_next = st.columns(3)
+    if col_prev.button("Previous", key="user_page_prev", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    col_page.write(f"Page {len(cursors)}")
+    if col_next.button("Next", key="user_page_next", disabled=not has_next):
+        cursors.append(user_store.page_cursor(rows[-1], sort))
+        st.rerun()
+
 def main():
     # Initialize the database
     init_db()
 
+    # Log back in from the session token, if there is one
+    restore_session()
+
     # Sidebar options
     if st.session_state.get('logged_in'):
         st.sidebar.button("Log Out", on_click=logout)
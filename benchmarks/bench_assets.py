@@ -0,0 +1,53 @@
+"""Bytes sent and time spent per rerun on the QR code and stylesheet assets.
+
+Usage: python benchmarks/bench_assets.py [--reruns N]
+"""
+import argparse
+import base64
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import assets  # noqa: E402
+
+
+# What auth.py and PythonRegex.py used to do on every rerun
+def legacy_qr_code_html():
+    with open(os.path.join(assets.STATIC_DIR, "qrcode.png"), 'rb') as f:
+        qr_code_base64 = base64.b64encode(f.read()).decode()
+    return f'{assets.QR_CODE_STYLE}    <img src="data:image/png;base64,{qr_code_base64}" class="qr-code">\n    '
+
+
+def legacy_stylesheet():
+    with open(os.path.join(assets.APP_DIR, "styles.css")) as css_file:
+        return f"<style>{css_file.read()}</style>"
+
+
+def time_per_rerun(func, reruns):
+    start = time.perf_counter()
+    for _ in range(reruns):
+        func()
+    return (time.perf_counter() - start) / reruns * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=5_000)
+    args = parser.parse_args()
+
+    cases = [
+        ("qr code, inline (before)", legacy_qr_code_html),
+        ("qr code, cached data URI", lambda: assets.qr_code_html(static=False)),
+        ("qr code, static URL", lambda: assets.qr_code_html(static=True)),
+        ("styles.css (before)", legacy_stylesheet),
+        ("styles.css, cached", lambda: f"<style>{assets.read_text('styles.css')}</style>"),
+    ]
+    for label, func in cases:
+        size = len(func().encode())
+        print(f"{label:<28} {size:8d} bytes/rerun {time_per_rerun(func, args.reruns):9.1f} us/rerun")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Chart payload size and preparation time with and without downsampling.
+
+Usage: python benchmarks/bench_downsample.py [--points 10000 100000 1000000] [--budget N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import downsample  # noqa: E402
+
+
+def price_series(points):
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2000-01-03", periods=points, freq="min")
+    closes = 100 + np.cumsum(rng.normal(0, 0.1, points))
+    return pd.DataFrame({"Date": dates, "Close": closes})
+
+
+def measure(build):
+    # Preparation covers building the figure and serializing it for the browser
+    start = time.perf_counter()
+    payload = build().to_json()
+    return time.perf_counter() - start, len(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--budget", type=int, default=downsample.POINT_BUDGET)
+    args = parser.parse_args()
+
+    for points in args.points:
+        df = price_series(points)
+        print(f"{points} points")
+        cases = [
+            ("px.line, every point (before)", lambda: px.line(df, x="Date", y="Close", title="before")),
+            ("lttb", lambda: downsample.line_chart(df, "Date", "Close", "lttb", args.budget, "lttb")),
+            ("minmax", lambda: downsample.line_chart(df, "Date", "Close", "minmax", args.budget, "minmax")),
+        ]
+        for label, build in cases:
+            elapsed, size = measure(build)
+            print(f"  {label:<32} {elapsed * 1000:9.1f} ms  {size / 1e6:8.2f} MB payload")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Files/sec of the batch formatter CLI at different worker counts, and resume.
+
+Generates a directory of text files, formats it with format_batch.run
+using 1 worker and then N workers, and checks the output against
+format_text. It then removes half of the outputs, as an interrupted run
+would leave them, and reruns to show that only those are redone, and
+that a rerun with other options redoes everything.
+
+Usage: python benchmarks/bench_format_batch.py [--files N] [--kb N] [--workers N]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import format_batch  # noqa: E402
+import text_formatter  # noqa: E402
+from bench_text_formatter import make_document  # noqa: E402
+
+
+def report(label, summary):
+    print(f"  {label:<22} {summary.formatted:5d} formatted {summary.skipped:5d} skipped  "
+          f"{summary.seconds:6.2f} s  {summary.files_per_second:7.1f} files/s  "
+          f"{summary.megabytes_per_second:6.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=400)
+    parser.add_argument("--kb", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = os.path.join(tmp, "in")
+        os.makedirs(inputs)
+        document = make_document(args.kb * 1000)
+        for i in range(args.files):
+            with open(os.path.join(inputs, f"doc{i:05d}.txt"), "w", encoding="utf-8") as f:
+                f.write(document)
+        print(f"{args.files} files x {args.kb} KB")
+
+        for workers in sorted({1, args.workers}):
+            output = os.path.join(tmp, f"out{workers}")
+            report(f"{workers} worker(s)", format_batch.run([inputs], output, workers=workers))
+
+        # Streaming in small chunks gives the same page as formatting the file whole
+        with open(os.path.join(output, "doc00000.html"), encoding="utf-8") as f:
+            head = format_batch.options_head(format_batch.DEFAULT_STYLES, text_formatter.INLINE)
+            body = text_formatter.format_text(document, *format_batch.DEFAULT_STYLES)
+            expected = head + format_batch.DOCUMENT_BODY + body + format_batch.DOCUMENT_TAIL
+            assert f.read() == expected
+        target = os.path.join(tmp, "small-chunks.html")
+        format_batch.format_file(os.path.join(inputs, "doc00000.txt"), target, chunk_size=4096)
+        with open(target, encoding="utf-8") as f:
+            assert f.read() == expected
+
+        for name in sorted(os.listdir(output))[::2]:
+            os.remove(os.path.join(output, name))
+        report("resume after removal", format_batch.run([inputs], output, workers=args.workers))
+        report("rerun, all up to date", format_batch.run([inputs], output, workers=args.workers))
+        summary = format_batch.run([inputs], output, mode=text_formatter.CLASSES, workers=args.workers)
+        assert summary.skipped == 0
+        report("rerun with --classes", summary)
+        shutil.rmtree(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Measure the per-rerun cost of database initialization before and after migrations.
+
+Usage: python benchmarks/bench_init_db.py [--reruns N]
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import user_store  # noqa: E402
+
+
+# The original init_db: schema probes plus an unconditional admin UPDATE on every rerun
+def legacy_init_db(path, trace):
+    conn = sqlite3.connect(path)
+    conn.set_trace_callback(trace)
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
+    if cursor.fetchone() is None:
+        cursor.execute("CREATE TABLE users (username TEXT PRIMARY KEY, password TEXT NOT NULL, role TEXT DEFAULT 'user')")
+    else:
+        cursor.execute("PRAGMA table_info(users)")
+        if not any(column[1] == "role" for column in cursor.fetchall()):
+            cursor.execute("ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'user'")
+            conn.commit()
+    cursor.execute("SELECT username FROM users WHERE username = ?", ("admin",))
+    if not cursor.fetchone():
+        cursor.execute("INSERT INTO users (username, password, role) VALUES (?, ?, ?)",
+                       ("admin", hashlib.sha256(b"admin123").hexdigest(), "admin"))
+    else:
+        cursor.execute("UPDATE users SET role = ? WHERE username = ?", ("admin", "admin"))
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.db")
+        statements = []
+        start = time.perf_counter()
+        for _ in range(args.reruns):
+            legacy_init_db(legacy_path, statements.append)
+        legacy = (time.perf_counter() - start) / args.reruns
+
+        path = os.path.join(tmp, "users.db")
+        user_store.ensure_schema(path)  # first run applies the migrations
+        pool = user_store.get_pool(path)
+        traced = []
+        with pool.connection() as conn:
+            conn.set_trace_callback(traced.append)
+        start = time.perf_counter()
+        for _ in range(args.reruns):
+            user_store.ensure_schema(path)
+        migrated = (time.perf_counter() - start) / args.reruns
+        user_store.close_all_pools()
+
+    print(f"legacy init_db : {legacy * 1e6:9.1f} us/rerun, {len(statements) / args.reruns:.0f} statements/rerun")
+    print(f"ensure_schema  : {migrated * 1e6:9.1f} us/rerun, {len(traced) / args.reruns:.0f} statements/rerun")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compare logins/sec for connect-per-call SQLite access against the pooled store.
+
+Usage: python benchmarks/bench_login.py [--users N] [--logins N] [--threads N]
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import user_store  # noqa: E402
+
+
+def hash_password(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def create_db(path, users):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (username TEXT PRIMARY KEY, password TEXT NOT NULL, role TEXT DEFAULT 'user')")
+    conn.executemany("INSERT INTO users VALUES (?, ?, 'user')",
+                     ((f"user{i}", hash_password(f"pw{i}")) for i in range(users)))
+    conn.commit()
+    conn.close()
+
+
+# The original auth.py access path: open, query, close on every call
+def verify_connect_per_call(path, username, password):
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute("SELECT password, role FROM users WHERE username = ?", (username,))
+    result = cursor.fetchone()
+    conn.close()
+    return bool(result) and result[0] == hash_password(password)
+
+
+def verify_pooled(path, username, password):
+    result = user_store.get_credentials(username, path=path)
+    return bool(result) and result[0] == hash_password(password)
+
+
+def run(verify, path, users, logins, threads):
+    def one(i):
+        n = i % users
+        assert verify(path, f"user{n}", f"pw{n}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(one, range(logins)))
+    return logins / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--logins", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "users.db")
+        create_db(path, args.users)
+        user_store.get_pool(path, size=args.threads)
+
+        for name, verify in [("connect-per-call", verify_connect_per_call), ("pooled", verify_pooled)]:
+            rate = run(verify, path, args.users, args.logins, args.threads)
+            print(f"{name:>18}: {rate:10.0f} logins/sec")
+
+        user_store.close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Per-rerun wall time, peak memory and stage timings of every page, as JSON.
+
+Runs auth.py, webscraper.py, PythonRegex.py and colorstyle.py headlessly
+with Streamlit's AppTest against local fixtures: a temporary users.db and
+prices.db, and generated sheets served by SheetServer. Each page goes
+through a short script of reruns (first load, an interaction, a plain
+rerun). Every step records its wall time, the spans collected by
+``profiling`` (verify_user, scrape and parse stages, format_block, ...)
+and, in a separate pass under tracemalloc, its peak Python memory.
+
+The report is written as JSON. With ``--compare`` the step times are
+checked against an earlier report and the exit status is 1 if any step
+got slower by more than ``--threshold`` percent.
+
+Usage: python benchmarks/bench_pages.py [--runs N] [--output FILE] [--compare FILE]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+# Fixtures have to be in place before the stores read their settings
+_tmp = tempfile.TemporaryDirectory()
+os.environ["USERS_DB_PATH"] = os.path.join(_tmp.name, "users.db")
+os.environ["PRICES_DB_PATH"] = os.path.join(_tmp.name, "prices.db")
+# Every run logs in as admin again; keep the login throttle out of the way
+os.environ.setdefault("LOGIN_USER_BURST", "1000000")
+
+import streamlit.logger  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import profiling  # noqa: E402
+import text_formatter  # noqa: E402
+import user_store  # noqa: E402
+from bench_text_formatter import make_document  # noqa: E402
+from sheet_server import SheetServer  # noqa: E402
+
+
+# AppTest runs pages without a server; its bare-mode warnings are noise here
+streamlit.logger.set_log_level("error")
+
+
+def widget(elements, label):
+    return next(element for element in elements if element.label == label)
+
+
+def auth_steps(args, server, n):
+    def login(at):
+        widget(at.text_input, "Username").input("admin")
+        widget(at.text_input, "Password").input("admin123")
+        at.button(key="login").click()
+
+    return [
+        ("first load", None),
+        ("admin login", login),
+        ("rerun with session", lambda at: None),
+    ]
+
+
+def webscraper_steps(args, server, n):
+    # New symbols on every pass, so each one downloads and parses its sheets
+    urls = [server.url(f"P{n}S{i}", args.rows) for i in range(args.sheets)]
+
+    def fetch(at):
+        widget(at.text_input, "Enter Google Sheet URL").input(urls[0])
+        widget(at.button, "Fetch Data").click()
+
+    def batch(at):
+        widget(at.text_area, "Google Sheet URLs, one per line").input("\n".join(urls))
+        widget(at.button, "Fetch Batch").click()
+
+    return [
+        ("first load", None),
+        ("fetch sheet", fetch),
+        ("fetch unchanged sheet", lambda at: widget(at.button, "Fetch Data").click()),
+        ("rerun with chart", lambda at: None),
+        ("fetch batch", batch),
+    ]
+
+
+def python_regex_steps(args, server, n):
+    document = make_document(int(args.text_mb * 1e6))
+
+    def format_text(at):
+        # Blocks formatted by an earlier pass would otherwise be reused
+        text_formatter._incremental.clear()
+        at.text_area[0].input(document)
+        widget(at.button, "Format Text").click()
+
+    return [
+        ("first load", None),
+        ("format text", format_text),
+        ("format unchanged text", lambda at: widget(at.button, "Format Text").click()),
+        ("rerun", lambda at: None),
+    ]
+
+
+def colorstyle_steps(args, server, n):
+    def select(at):
+        box = widget(at.sidebar.selectbox, "Select Palette")
+        box.select(box.options[1])
+
+    return [
+        ("first load", None),
+        ("select palette", select),
+        ("rerun", lambda at: None),
+    ]
+
+
+PAGES = {
+    "auth": ("auth.py", auth_steps),
+    "webscraper": ("webscraper.py", webscraper_steps),
+    "PythonRegex": ("PythonRegex.py", python_regex_steps),
+    "colorstyle": ("colorstyle.py", colorstyle_steps),
+}
+
+
+def run_page(script, steps, timeout, trace=False):
+    """One pass through ``steps``: a list of (label, wall ms, spans, peak bytes)."""
+    at = AppTest.from_file(os.path.join(APP_DIR, script), default_timeout=timeout)
+    results = []
+    for label, interact in steps:
+        if interact is not None:
+            interact(at)
+        if trace:
+            tracemalloc.reset_peak()
+        with profiling.collect() as spans:
+            start = time.perf_counter()
+            at.run()
+            elapsed = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{script}, {label}: {at.exception[0].value}")
+        peak = tracemalloc.get_traced_memory()[1] if trace else None
+        results.append((label, elapsed * 1000, spans, peak))
+    return results
+
+
+def profile_page(script, steps, runs, timeout):
+    """Median step timings over ``runs`` passes; ``steps(n)`` builds the steps of pass ``n``."""
+    timings = [run_page(script, steps(n), timeout) for n in range(runs)]
+    # Peaks come from a separate pass; tracing slows everything down
+    tracemalloc.start()
+    try:
+        traced = run_page(script, steps(runs), timeout, trace=True)
+    finally:
+        tracemalloc.stop()
+    report = []
+    for i, (label, *_) in enumerate(traced):
+        walls = [run[i][1] for run in timings]
+        report.append({
+            "step": label,
+            "wall_ms": {"median": statistics.median(walls), "min": min(walls), "max": max(walls)},
+            "peak_mb": traced[i][3] / 1e6,
+            "spans": median_spans([run[i][2] for run in timings]),
+        })
+    return report
+
+
+def median_spans(runs):
+    """Per-span median count and total over ``runs``, and the longest single call."""
+    names = sorted({name for spans in runs for name in spans})
+    empty = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+    return {name: {
+        "count": statistics.median(spans.get(name, empty)["count"] for spans in runs),
+        "total_ms": statistics.median(spans.get(name, empty)["total_ms"] for spans in runs),
+        "max_ms": max(spans.get(name, empty)["max_ms"] for spans in runs),
+    } for name in names}
+
+
+def compare(report, baseline, threshold):
+    """Print per-step changes against ``baseline``; returns the number of regressions."""
+    regressions = 0
+    for page, steps in report["pages"].items():
+        before = {step["step"]: step for step in baseline.get("pages", {}).get(page, [])}
+        for step in steps:
+            old = before.get(step["step"])
+            if old is None:
+                continue
+            new_ms, old_ms = step["wall_ms"]["median"], old["wall_ms"]["median"]
+            change = (new_ms - old_ms) / old_ms * 100 if old_ms else 0.0
+            flag = "  REGRESSION" if change > threshold else ""
+            regressions += bool(flag)
+            print(f"  {page:<12} {step['step']:<24} {old_ms:9.1f} -> {new_ms:9.1f} ms  {change:+6.1f}%{flag}",
+                  file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="timed passes per page")
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("--rows", type=int, default=5_000, help="rows per generated sheet")
+    parser.add_argument("--sheets", type=int, default=4, help="sheets in the batch step")
+    parser.add_argument("--text-mb", type=float, default=1.0, help="size of the formatted document")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds allowed per rerun")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="earlier JSON report to compare step times against")
+    parser.add_argument("--threshold", type=float, default=20.0, help="slowdown in percent counted as a regression")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "settings": {"rows": args.rows, "sheets": args.sheets, "text_mb": args.text_mb},
+        "pages": {},
+    }
+    with SheetServer() as server:
+        for page in args.pages:
+            script, steps = PAGES[page]
+            report["pages"][page] = profile_page(script, lambda n: steps(args, server, n), args.runs, args.timeout)
+    user_store.close_all_pools()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
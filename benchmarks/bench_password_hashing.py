@@ -0,0 +1,59 @@
+"""p50/p99 login latency with scrypt hashing at N concurrent sessions.
+
+Usage: python benchmarks/bench_password_hashing.py [--sessions 1 8 32] [--logins N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import password_hashing  # noqa: E402
+import user_store  # noqa: E402
+
+
+def login(path, username, password):
+    stored, _ = user_store.get_credentials(username, path=path)
+    return password_hashing.verify_password(password, stored)
+
+
+def percentile(samples, pct):
+    return statistics.quantiles(samples, n=100)[pct - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--logins", type=int, default=10, help="logins per session")
+    args = parser.parse_args()
+
+    n, r, p = password_hashing.get_params()
+    print(f"scrypt parameters: N={n} r={r} p={p}, {password_hashing.HASH_WORKERS} hashing workers")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "users.db")
+        user_store.ensure_schema(path)
+        user_store.add_user("bench", password_hashing.hash_password("secret"), path=path)
+
+        for sessions in args.sessions:
+            def session(_):
+                latencies = []
+                for _ in range(args.logins):
+                    start = time.perf_counter()
+                    assert login(path, "bench", "secret")
+                    latencies.append((time.perf_counter() - start) * 1000)
+                return latencies
+
+            with ThreadPoolExecutor(max_workers=sessions) as executor:
+                samples = [ms for result in executor.map(session, range(sessions)) for ms in result]
+            print(f"{sessions:4d} sessions: p50 {percentile(samples, 50):8.1f} ms   p99 {percentile(samples, 99):8.1f} ms")
+
+        user_store.close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Refresh lag, request counts and appends of the background refresh scheduler.
+
+Tracks several sheets on a local stand-in server, lets the scheduler run,
+grows the sheets mid-run and checks that only the new rows are appended
+and that reading the store makes no requests.
+
+Usage: python benchmarks/bench_refresh.py [--sheets N] [--rows N] [--interval S] [--duration S]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import price_store  # noqa: E402
+import refresh_scheduler  # noqa: E402
+import user_store  # noqa: E402
+from sheet_server import SheetServer  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sheets", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=2_000)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, SheetServer() as server:
+        path = os.path.join(tmp, "prices.db")
+        scheduler = refresh_scheduler.RefreshScheduler(interval=args.interval, tick=0.05, store_path=path)
+        urls = [server.url(f"SYM{i}", args.rows) for i in range(args.sheets)]
+        for url in urls:
+            scheduler.track(url)
+        scheduler.start()
+
+        lags = []
+        deadline = time.time() + args.duration
+        grown = False
+        while time.time() < deadline:
+            if not grown and time.time() > deadline - args.duration / 2:
+                server.growth = 25
+                grown = True
+            lags.extend(lag for lag in scheduler.refresh_lag().values() if lag is not None)
+            time.sleep(0.05)
+        scheduler.stop()
+
+        before = server.requests
+        for url in urls:
+            price_store.load_prices(url, path)
+        assert server.requests == before, "reading the store must not hit the network"
+        stored = [len(price_store.load_prices(url, path)) for url in urls]
+        assert stored == [args.rows + 25] * args.sheets, stored
+
+        durations = [row[5] for row in price_store.tracked_sheets(path)]
+        print(f"{args.sheets} sheets x {args.rows} rows, interval {args.interval}s, ran {args.duration}s")
+        print(f"  requests {server.requests} ({server.not_modified} answered 304)")
+        print(f"  rows stored per sheet {stored[0]} (grew by 25 mid-run, appended once)")
+        print(f"  refresh lag  p50 {statistics.median(lags):.2f}s  max {max(lags):.2f}s")
+        print(f"  last refresh duration p50 {statistics.median(durations) * 1000:.1f} ms")
+        user_store.close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Per-rerun cost of server-side sessions against the old login state.
+
+Before sessions, a login put ``username`` and ``role`` into the browser
+session's state and reruns trusted them: no work per rerun, but a role
+change or a deleted account never applied until the user logged in
+again. Now every rerun looks its session id up in session_store, which
+re-reads the role from the user database at most every ``ROLE_TTL``
+seconds. The benchmark reports p50/p99 of that lookup next to the old
+state read, role reads per 1,000 reruns at a given rerun interval, and
+how many reruns it takes for a role change made elsewhere to show up.
+
+Usage: python benchmarks/bench_sessions.py [--reruns N] [--sessions N] [--interval S]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import password_hashing  # noqa: E402
+import session_store  # noqa: E402
+import user_store  # noqa: E402
+
+
+class CountingGetRole:
+    """Wraps user_store.get_role to count database reads."""
+
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.func(*args, **kwargs)
+
+
+class FakeClock:
+    """Advances by ``step`` seconds on every ``tick``, one per simulated rerun."""
+
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def tick(self):
+        self.now += self.step
+
+    def __call__(self):
+        return self.now
+
+
+def timed(func, reruns):
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples), statistics.quantiles(samples, n=100)[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=1_000)
+    parser.add_argument("--sessions", type=int, default=50, help="concurrent sessions cycled through")
+    parser.add_argument("--interval", type=float, default=1.0, help="simulated seconds between reruns")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "users.db")
+        user_store.ensure_schema(path)
+        user_store.add_user("alice", password_hashing.hash_password("secret-pass"), "user", path)
+        counter = CountingGetRole(user_store.get_role)
+        user_store.get_role = counter
+        clock = FakeClock(args.interval)
+        store = session_store.SessionStore(path, clock=clock)
+        session_ids = [store.create("alice", "user") for _ in range(args.sessions)]
+        state = {"logged_in": True, "username": "alice", "role": "user"}
+        rerun = iter(range(10 ** 9))
+
+        def state_only():
+            assert (state["username"], state["role"]) == ("alice", "user")
+
+        def lookup():
+            clock.tick()
+            assert store.lookup(session_ids[next(rerun) % len(session_ids)]) == ("alice", "user")
+
+        print(f"{args.reruns} reruns over {args.sessions} sessions, one every {args.interval:g} s, "
+              f"role TTL {store.role_ttl:g} s")
+        for label, func in [("before: role kept in state", state_only), ("session lookup", lookup)]:
+            before = counter.calls
+            p50, p99 = timed(func, args.reruns)
+            print(f"  {label:<30} p50 {p50:9.2f} us  p99 {p99:9.2f} us   "
+                  f"DB: {(counter.calls - before) * 1000 / args.reruns:.0f} role reads per 1000 reruns")
+
+        # A role change made by another process (or directly in the database)
+        user_store.update_role("alice", "admin", path)
+        reruns = 0
+        while store.lookup(session_ids[0]) != ("alice", "admin"):
+            clock.tick()
+            reruns += 1
+        print(f"  role change from another process seen after {reruns} reruns "
+              f"({reruns * args.interval:g} s); before: not until the next login")
+        before = counter.calls
+        store.set_role("alice", "user")
+        roles = {store.lookup(session_id) for session_id in session_ids}
+        assert roles == {("alice", "user")}, roles
+        print(f"  set_role picked up by all {args.sessions} sessions on their next rerun "
+              f"with {counter.calls - before} reads")
+        user_store.close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Wall-clock time of the batch sheet loader against loading sheets one by one.
+
+Serves the sheets from a local stand-in server that delays every response,
+includes one missing sheet to check that a failure doesn't abort the batch,
+and compares ``sheet_batch.fetch_batch`` with a sequential
+``sheet_source.load_sheet`` loop.
+
+Usage: python benchmarks/bench_sheet_batch.py [--sheets N] [--rows N] [--delay S] [--concurrency N] [--workers N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sheet_batch  # noqa: E402
+import sheet_fetch  # noqa: E402
+import sheet_source  # noqa: E402
+from sheet_server import SheetServer  # noqa: E402
+
+
+def sequential(urls, fetcher):
+    sheets, errors = {}, {}
+    for url in urls:
+        try:
+            sheets[url] = sheet_source.load_sheet(url, fetcher)
+        except Exception as e:
+            errors[url] = e
+    return sheets, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sheets", type=int, default=24)
+    parser.add_argument("--rows", type=int, default=2_000)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, default=sheet_batch.MAX_CONCURRENCY)
+    parser.add_argument("--workers", type=int, default=sheet_batch.PARSE_WORKERS)
+    args = parser.parse_args()
+
+    with SheetServer(delay=args.delay) as server:
+        urls = [server.url(f"SYM{i}", args.rows) for i in range(args.sheets)]
+        urls.append(f"{server.base_url}/missing")
+
+        # Start the parse workers outside the timed runs
+        if args.workers:
+            sheet_batch.fetch_batch(urls[:1], parse_workers=args.workers,
+                                    fetcher=sheet_fetch.SheetFetcher(retries=0, ttl=0))
+
+        start = time.perf_counter()
+        sheets, errors = sequential(urls, sheet_fetch.SheetFetcher(retries=0, ttl=0))
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = sheet_batch.fetch_batch(urls, args.concurrency, args.workers,
+                                        sheet_fetch.SheetFetcher(retries=0, ttl=0))
+        batch_time = time.perf_counter() - start
+
+        assert set(batch.sheets) == set(sheets) and set(batch.errors) == set(errors), batch.errors
+        assert len(batch.frame) == sum(len(sheet.frame) for sheet in sheets.values())
+        assert batch.frame["Symbol"].nunique() == args.sheets
+
+    print(f"{args.sheets} sheets x {args.rows} rows + 1 missing, {args.delay * 1000:.0f} ms per response")
+    print(f"  sequential {sequential_time:8.2f} s")
+    print(f"  batch      {batch_time:8.2f} s  ({args.concurrency} concurrent, {args.workers} parse workers)"
+          f"  {sequential_time / batch_time:.1f}x")
+    print(f"  combined frame {len(batch.frame)} rows, errors: {list(batch.errors.values())}")
+
+
+if __name__ == "__main__":
+    main()
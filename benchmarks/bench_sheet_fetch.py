@@ -0,0 +1,58 @@
+"""Request counts and latency of the cached sheet fetcher against a local server.
+
+Runs fully offline: cold fetch, fresh cache hit, 304 revalidation after the
+TTL, a changed sheet, and the bare requests.get path it replaced.
+
+Usage: python benchmarks/bench_sheet_fetch.py [--rows N] [--ttl SECONDS]
+"""
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sheet_fetch  # noqa: E402
+import table_extract  # noqa: E402
+from sheet_server import SheetServer  # noqa: E402
+
+
+def step(server, label, func):
+    before = server.requests
+    start = time.perf_counter()
+    rows = func()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{label:<30} {elapsed:9.1f} ms  {server.requests - before} request(s)  {len(rows)} rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000)
+    parser.add_argument("--ttl", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with SheetServer() as server:
+        url = server.url("TEST", args.rows)
+        fetcher = sheet_fetch.SheetFetcher(ttl=args.ttl)
+
+        def fetch():
+            return fetcher.get_parsed(url, table_extract.extract_rows)
+
+        def legacy():
+            return table_extract.extract_rows(requests.get(url).text)
+
+        step(server, "requests.get + parse (before)", legacy)
+        step(server, "cold fetch + parse", fetch)
+        step(server, "within TTL", fetch)
+        time.sleep(args.ttl)
+        step(server, "after TTL, 304 revalidation", fetch)
+        assert server.not_modified == 1
+        server.version = "2"
+        time.sleep(args.ttl)
+        step(server, "after TTL, sheet changed", fetch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Time and allocations of building the typed price table from scraped rows.
+
+Compares the previous chain (DataFrame, to_datetime, dropna, sort_values,
+to_numeric, dropna) with sheet_frame.build_price_frame on the same rows.
+
+Usage: python benchmarks/bench_sheet_frame.py [--rows N]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sheet_frame  # noqa: E402
+from sheet_server import HEADERS, sheet_rows  # noqa: E402
+
+
+def legacy_frame(data, headers):
+    df = pd.DataFrame(data, columns=headers)
+    df["Date"] = pd.to_datetime(df["Date"], errors='coerce')
+    df = df.dropna().sort_values(by="Date", ascending=True, kind="stable")
+    df["Close"] = pd.to_numeric(df["Close"], errors='coerce')
+    return df.dropna()
+
+
+def measure(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<26} {elapsed:8.2f} s   peak allocations {peak / 1e6:8.1f} MB")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    data = list(sheet_rows("BENCH", args.rows))[2:]
+    # Newest first, as sheets are often kept, so the sort has work to do
+    data.reverse()
+    print(f"{len(data)} rows")
+    before = measure("legacy chain (before)", lambda: legacy_frame(data, HEADERS))
+    after = measure("build_price_frame", lambda: sheet_frame.build_price_frame(data, HEADERS))
+    pd.testing.assert_frame_equal(before, after, check_index_type=False)
+
+
+if __name__ == "__main__":
+    main()
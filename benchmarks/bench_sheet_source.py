@@ -0,0 +1,75 @@
+"""Parse time and peak memory of the CSV export path against HTML scraping.
+
+Both inputs describe the same generated sheet; the resulting Date/Close
+columns are checked to match. A small sheet with blank cells is first
+checked to give identical tables through both paths.
+
+Usage: python benchmarks/bench_sheet_source.py [--rows 10000 100000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sheet_source  # noqa: E402
+from sheet_server import sheet_csv, sheet_html, table_csv, table_html  # noqa: E402
+
+# Blank cells in a mostly empty Notes column and elsewhere; only the row
+# without a Close is dropped
+BLANKS = [
+    ["BLANKS", "", "", "", "", ""],
+    ["Date", "Open", "High", "Low", "Close", "Notes"],
+    ["2024-01-02", "1.00", "2.00", "0.50", "1.50", ""],
+    ["2024-01-03", "", "2.10", "0.60", "1.60", "split"],
+    ["2024-01-04", "1.10", "", "", "1.70", ""],
+    ["2024-01-05", "1.20", "2.20", "0.70", "", ""],
+]
+
+
+def measure(func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def typed(frame):
+    return pd.DataFrame({
+        "Date": pd.to_datetime(frame["Date"], format="%Y-%m-%d"),
+        "Close": pd.to_numeric(frame["Close"]),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    from_html = sheet_source.parse_html(table_html(BLANKS)).frame
+    from_csv = sheet_source.parse_csv(table_csv(BLANKS)).frame
+    pd.testing.assert_frame_equal(from_html, from_csv, check_index_type=False)
+    assert len(from_csv) == len(BLANKS) - 3, from_csv
+    print(f"blank cells: csv and html both keep {len(from_csv)} of {len(BLANKS) - 2} rows")
+
+    for rows in args.rows:
+        html = sheet_html("BENCH", rows)
+        text = sheet_csv("BENCH", rows)
+        print(f"{rows} rows: {len(html) / 1e6:.1f} MB HTML, {len(text) / 1e6:.1f} MB CSV")
+        from_html, html_time, html_peak = measure(lambda: sheet_source.parse_html(html))
+        from_csv, csv_time, csv_peak = measure(lambda: sheet_source.parse_csv(text))
+        pd.testing.assert_frame_equal(typed(from_html.frame), typed(from_csv.frame))
+        print(f"  html scrape  {html_time:8.2f} s   peak {html_peak / 1e6:8.1f} MB")
+        print(f"  csv export   {csv_time:8.2f} s   peak {csv_peak / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Cold-start import cost of the app.py navigator, measured with ``-X importtime``.
+
+"Eager" imports every registered page's top-level dependencies up front,
+which is what app.py's old direct imports would cost with all pages
+mounted. "Lazy" is what app.py now does: streamlit, page_registry and the
+first page only. Each case runs in a fresh interpreter and the benchmark
+sums the importtime self times.
+
+Usage: python benchmarks/bench_startup.py [--runs N] [--top N]
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+import page_registry  # noqa: E402
+
+
+def page_imports(page):
+    """Modules importing ``page`` eagerly would load.
+
+    Module pages are imported themselves. Script pages would run if
+    imported, so only their top-level imports are counted.
+    """
+    with open(os.path.join(APP_DIR, page.module + ".py"), "rb") as f:
+        tree = ast.parse(f.read())
+    names = [page.module] if page.entry is not None else []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+    return names
+
+
+def importtime(statement):
+    """(total self time in ms, modules imported, heaviest modules) for ``statement``."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=APP_DIR,
+                            capture_output=True, text=True, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules.append((int(self_us), name.strip()))
+    return sum(us for us, _ in modules) / 1000, len(modules), sorted(modules, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    first = page_registry.PAGES[0]
+    eager = sorted({name for page in page_registry.PAGES for name in page_imports(page)})
+    cases = [
+        ("eager (before)", "import " + ", ".join(eager)),
+        ("lazy registry", f"import streamlit, page_registry, {first.module}"),
+    ]
+    for label, statement in cases:
+        runs = [importtime(statement) for _ in range(args.runs)]
+        total = statistics.median(run[0] for run in runs)
+        _, count, heaviest = runs[-1]
+        print(f"{label:<16} {total:8.1f} ms  {count:5d} modules")
+        for us, name in heaviest[:args.top]:
+            print(f"    {us / 1000:7.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Time and peak memory of each table extraction engine on generated sheet HTML.
+
+Every engine's output is checked against the original full-tree
+BeautifulSoup path before it is timed.
+
+Usage: python benchmarks/bench_table_extract.py [--rows 10000 100000] [--extra-columns N]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import table_extract  # noqa: E402
+from sheet_server import sheet_html  # noqa: E402
+
+
+# What webscraper.py did before the extraction engines existed
+def original_rows(html):
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("table")
+    return [[cell.text.strip() for cell in row.find_all("td")[:6]] for row in table.find_all("tr")]
+
+
+def measure(func):
+    # Timed without tracing (tracemalloc slows pure-Python parsers severalfold),
+    # then run again under tracemalloc for the peak
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--extra-columns", type=int, default=4,
+                        help="columns beyond F in the generated sheet")
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        html = sheet_html("BENCH", rows, extra_columns=args.extra_columns)
+        print(f"{rows} rows, {len(html) / 1e6:.1f} MB of HTML")
+        expected, elapsed, peak = measure(lambda: original_rows(html))
+        print(f"  {'bs4 full tree (before)':<24} {elapsed:8.2f} s   peak {peak / 1e6:8.1f} MB")
+        for engine in table_extract.ENGINES:
+            result, elapsed, peak = measure(lambda: list(table_extract.iter_rows(html, engine=engine)))
+            assert result == expected, f"{engine} output differs from the original path"
+            print(f"  {engine:<24} {elapsed:8.2f} s   peak {peak / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
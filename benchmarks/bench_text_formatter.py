@@ -0,0 +1,95 @@
+"""Throughput (MB/s) of the header/section formatter behind PythonRegex.py.
+
+Compares the previous regex-per-line loop with text_formatter.format_text
+on a generated document and checks that both produce identical HTML,
+including on edge cases such as ``[]``, indented brackets and blank lines.
+
+Usage: python benchmarks/bench_text_formatter.py [--mb N] [--repeat N]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import text_formatter  # noqa: E402
+
+HEADER = text_formatter.TextStyle("24px", "Arial", "#4CAF50")
+SECTION = text_formatter.TextStyle("22px", "Georgia", "#FF9800")
+PARAGRAPH = text_formatter.TextStyle("16px", "Courier New", "#000000")
+
+header_pattern = re.compile(r'^\[(.*?)\]$')
+section_header_pattern = re.compile(r'^\{(.*?)\}$')
+
+EDGE_CASES = "\n".join([
+    "[]", "{}", "[", "]", "{", "[a]b]", " [indented]", "[trailing] ", "{mixed]", "[x}",
+    "", "   ", "\t", "plain  ", "[nested [x]]", "{a}{b}", "line\rwith\x0bbreaks here",
+])
+
+
+def legacy_format(text, header, section, paragraph):
+    formatted_lines = []
+    for line in text.splitlines():
+        if header_pattern.match(line):
+            header_text = header_pattern.match(line).group(1)
+            formatted_lines.append(f"<h1 style='color: {header.font_color}; font-family: {header.font_family}; font-size: {header.font_size};'>{header_text}</h1>")
+        elif section_header_pattern.match(line):
+            section_header_text = section_header_pattern.match(line).group(1)
+            formatted_lines.append(f"<h2 style='color: {section.font_color}; font-family: {section.font_family}; font-size: {section.font_size};'>{section_header_text}</h2>")
+        elif line.strip():
+            formatted_lines.append(f"<p style='color: {paragraph.font_color}; font-family: {paragraph.font_family}; font-size: {paragraph.font_size};'>{line.strip()}</p>")
+    return "\n".join(formatted_lines)
+
+
+def make_document(size):
+    rng = random.Random(0)
+    words = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor".split()
+    lines, total = [], 0
+    while total < size:
+        kind = rng.random()
+        text = " ".join(rng.choices(words, k=rng.randint(2, 14)))
+        if kind < 0.05:
+            line = f"[{text}]"
+        elif kind < 0.15:
+            line = f"{{{text}}}"
+        elif kind < 0.25:
+            line = ""
+        else:
+            line = f"  {text}  " if kind > 0.9 else text
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)
+
+
+def throughput(func, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text, HEADER, SECTION, PARAGRAPH)
+        best = min(best, time.perf_counter() - start)
+    return len(text.encode()) / 1e6 / best, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=float, default=10.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_document(int(args.mb * 1e6))
+    for sample in (EDGE_CASES, text):
+        assert (text_formatter.format_text(sample, HEADER, SECTION, PARAGRAPH)
+                == legacy_format(sample, HEADER, SECTION, PARAGRAPH))
+
+    print(f"{len(text.encode()) / 1e6:.1f} MB, {text.count(chr(10)) + 1} lines, best of {args.repeat}")
+    before, before_time = throughput(legacy_format, text, args.repeat)
+    after, after_time = throughput(text_formatter.format_text, text, args.repeat)
+    print(f"  regex per line (before) {before:8.1f} MB/s  {before_time * 1000:8.1f} ms")
+    print(f"  format_text             {after:8.1f} MB/s  {after_time * 1000:8.1f} ms  {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Re-render time after a one-line edit with the incremental block formatter.
+
+Formats a 100k-line document once to warm text_formatter's block cache,
+then edits (and separately inserts) a single line in the middle. It
+compares re-rendering through IncrementalFormatter with a full
+format_text, and reports the time to the first chunk and the number of
+blocks that had to be formatted again.
+
+Usage: python benchmarks/bench_text_incremental.py [--lines N] [--block-lines N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import text_formatter  # noqa: E402
+from bench_text_formatter import HEADER, PARAGRAPH, SECTION, make_document  # noqa: E402
+
+
+def full(text):
+    start = time.perf_counter()
+    html = text_formatter.format_text(text, HEADER, SECTION, PARAGRAPH)
+    return html, time.perf_counter() - start
+
+
+def incremental(formatter, text):
+    misses = formatter.misses
+    start = time.perf_counter()
+    chunks = formatter.iter_html(text, HEADER, SECTION, PARAGRAPH)
+    first = [next(chunks)]
+    first_time = time.perf_counter() - start
+    html = "\n".join(first + list(chunks))
+    return html, time.perf_counter() - start, first_time, formatter.misses - misses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--block-lines", type=int, default=text_formatter.BLOCK_LINES)
+    args = parser.parse_args()
+
+    lines = make_document(args.lines * 60).splitlines()[:args.lines]
+    text = "\n".join(lines)
+    middle = len(lines) // 2
+    edited = "\n".join(lines[:middle] + ["[An edited header]"] + lines[middle + 1:])
+    inserted = "\n".join(lines[:middle] + ["An inserted paragraph"] + lines[middle:])
+
+    formatter = text_formatter.IncrementalFormatter(args.block_lines)
+    _, cold, _, blocks = incremental(formatter, text)
+    print(f"{len(lines)} lines, {len(text.encode()) / 1e6:.1f} MB, {blocks} blocks of ~{args.block_lines} lines")
+    print(f"  first render (cold)          {cold * 1000:7.1f} ms")
+    for label, changed in (("one line edited", edited), ("one line inserted", inserted)):
+        expected, full_time = full(changed)
+        html, total, first, reformatted = incremental(formatter, changed)
+        assert html == expected
+        print(f"  {label}:")
+        print(f"    full format_text           {full_time * 1000:7.1f} ms")
+        print(f"    incremental                {total * 1000:7.1f} ms  {full_time / total:.1f}x"
+              f"   first chunk {first * 1000:.1f} ms   blocks reformatted {reformatted}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Output size and render time of inline vs class-based formatter output.
+
+Formats a generated document (1 MB by default) in both output modes.
+Repeated clicks with unchanged text are measured by
+bench_text_incremental.py.
+
+Usage: python benchmarks/bench_text_render.py [--mb N] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import text_formatter  # noqa: E402
+from bench_text_formatter import HEADER, PARAGRAPH, SECTION, make_document  # noqa: E402
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_document(int(args.mb * 1e6))
+    print(f"{len(text.encode()) / 1e6:.1f} MB input, {text.count(chr(10)) + 1} lines, best of {args.repeat}")
+    for mode in (text_formatter.INLINE, text_formatter.CLASSES):
+        html = text_formatter.format_text(text, HEADER, SECTION, PARAGRAPH, mode)
+        uncached = best_time(lambda: text_formatter.format_text(text, HEADER, SECTION, PARAGRAPH, mode),
+                             args.repeat)
+        print(f"  {mode:<8} output {len(html.encode()) / 1e6:6.2f} MB   render {uncached * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Time and bytes injected per colorstyle.py rerun, before and after the theme cache.
+
+The previous page read styles.css from disk and built a ``:root`` block for
+the selected palette on every rerun. theme.stylesheet serves a minified,
+pre-rendered block per palette and looks at the files at most once per
+theme.CHECK_INTERVAL. The benchmark also edits a copy of the
+palette file to show that a change is picked up on the next call.
+
+Usage: python benchmarks/bench_theme.py [--reruns N]
+"""
+import argparse
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import assets  # noqa: E402
+import theme  # noqa: E402
+
+
+# What colorstyle.py used to inject on every rerun
+def legacy_injection(selected_palette):
+    with open(os.path.join(assets.APP_DIR, "styles.css")) as css_file:
+        base = f"<style>{css_file.read()}</style>"
+    variables = f"""
+    <style>
+    :root {{
+        --top-bar-color: {selected_palette["top_bar_color"]};
+        --sidebar-bg-color: {selected_palette["sidebar_bg_color"]};
+        --main-bg-color: {selected_palette["main_bg_color"]};
+        --button-color: {selected_palette["button_color"]};
+        --text-color: {selected_palette["text_color"]};
+    }}
+    </style>
+    """
+    return [base, variables]
+
+
+def per_rerun(func, reruns):
+    names = itertools.cycle(theme.palettes())
+    start = time.perf_counter()
+    for _ in range(reruns):
+        func(next(names))
+    return (time.perf_counter() - start) / reruns * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=20_000)
+    args = parser.parse_args()
+
+    palettes = theme.palettes()
+    name = next(iter(palettes))
+    before = sum(len(block.encode()) for block in legacy_injection(palettes[name]))
+    after = len(theme.stylesheet(name).encode())
+    legacy_time = per_rerun(lambda n: legacy_injection(palettes[n]), args.reruns)
+    cached_time = per_rerun(theme.stylesheet, args.reruns)
+    print(f"{len(palettes)} palettes, {args.reruns} reruns cycling through them")
+    print(f"  read + build (before)  {before:6d} bytes/rerun {legacy_time:8.1f} us/rerun")
+    print(f"  theme.stylesheet       {after:6d} bytes/rerun {cached_time:8.1f} us/rerun")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "palettes.json")
+        shutil.copy(os.path.join(assets.APP_DIR, "palettes.json"), path)
+        theme.stylesheet(name, path)
+        edited = dict(palettes, **{name: dict(palettes[name], button_color="#123456")})
+        with open(path, "w") as f:
+            json.dump(edited, f)
+        # Make the next call look at the files rather than wait for the interval
+        theme.CHECK_INTERVAL = 0
+        start = time.perf_counter()
+        sheet = theme.stylesheet(name, path)
+        print(f"  reload after editing the palette file {(time.perf_counter() - start) * 1000:.2f} ms")
+        assert "--button-color:#123456" in sheet
+
+
+if __name__ == "__main__":
+    main()
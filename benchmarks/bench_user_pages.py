@@ -0,0 +1,87 @@
+"""Time and peak memory of the paginated admin listing on a synthetic user table.
+
+Walks the whole table page by page and compares against loading it with
+fetchall() the way the admin view used to.
+
+Usage: python benchmarks/bench_user_pages.py [--users N] [--page-size N]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import user_store  # noqa: E402
+
+
+def create_users(path, users):
+    user_store.ensure_schema(path)
+    with user_store.get_pool(path).connection() as conn:
+        conn.executemany("INSERT INTO users (username, password, role) VALUES (?, ?, ?)",
+                         ((f"user{i:07d}", "x" * 64, "admin" if i % 100 == 0 else "user")
+                          for i in range(users)))
+
+
+def measure(label, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<34} {elapsed * 1000:10.1f} ms   peak {peak / 1e6:8.2f} MB   {result}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "users.db")
+        create_users(path, args.users)
+
+        def fetchall():
+            conn = sqlite3.connect(path)
+            rows = conn.execute("SELECT username, password, role FROM users").fetchall()
+            conn.close()
+            return f"{len(rows)} rows"
+
+        def first_page():
+            return f"{len(user_store.fetch_users_page(limit=args.page_size, path=path))} rows"
+
+        def deep_page():
+            after = (f"user{args.users - 100:07d}",)
+            return f"{len(user_store.fetch_users_page(after, args.page_size, path=path))} rows"
+
+        def role_page():
+            rows = user_store.fetch_users_page(limit=args.page_size, role="admin", sort="role", path=path)
+            return f"{len(rows)} rows"
+
+        def search_page():
+            rows = user_store.fetch_users_page(limit=args.page_size, search=f"user{args.users // 2:07d}"[:-2], path=path)
+            return f"{len(rows)} rows"
+
+        def walk():
+            total = 0
+            for page in user_store.iter_user_pages(batch_size=1000, path=path):
+                total += len(page)
+            return f"{total} rows"
+
+        measure("fetchall (previous admin view)", fetchall)
+        measure("first page", first_page)
+        measure("page near the end", deep_page)
+        measure("role filter, sorted by role", role_page)
+        measure("username prefix search", search_page)
+        measure("keyset walk of whole table", walk)
+
+        user_store.close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
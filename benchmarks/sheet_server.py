@@ -0,0 +1,159 @@
+"""Local stand-in for a published Google Sheet, used by the scraper benchmarks.
+
+Serves a generated stock table at ``/<symbol>?rows=N`` in the layout the
+scraper expects: a stock name row, a header row, then one row per day. It
+answers If-None-Match with 304, can add a fixed delay per response and counts
+every request it receives.
+"""
+import datetime
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+HEADERS = ["Date", "Open", "High", "Low", "Close", "Volume"]
+
+
+# Long fixtures switch to minute bars so dates stay within pandas' range
+INTRADAY_ROWS = 50_000
+
+
+def sheet_rows(symbol, rows, start=datetime.datetime(2000, 1, 3)):
+    """Rows of cell strings: name row, header row, then ``rows`` price bars.
+
+    Bars are daily up to ``INTRADAY_ROWS`` rows and one minute apart beyond.
+    """
+    yield [symbol, "", "", "", "", ""]
+    yield list(HEADERS)
+    daily = rows <= INTRADAY_ROWS
+    step = datetime.timedelta(days=1) if daily else datetime.timedelta(minutes=1)
+    price = 100.0
+    for i in range(rows):
+        moment = start + step * i
+        stamp = moment.date().isoformat() if daily else moment.strftime("%Y-%m-%d %H:%M")
+        price = max(1.0, price + ((i * 7919) % 200 - 99) / 100)
+        yield [stamp, f"{price:.2f}", f"{price + 1:.2f}", f"{price - 1:.2f}",
+               f"{price + 0.5:.2f}", str(1000 + i % 5000)]
+
+
+def sheet_html(symbol, rows, extra_columns=0):
+    """HTML shaped like a published sheet, with optional columns beyond F."""
+    return table_html(sheet_rows(symbol, rows), extra_columns)
+
+
+def table_html(rows, extra_columns=0):
+    """Published-sheet HTML for the given rows of six cell strings."""
+    parts = ['<html><head><title>sheet</title></head><body><div id="sheets-viewport">',
+             '<table class="waffle"><thead><tr><th></th>']
+    parts.extend(f"<th>{chr(65 + i)}</th>" for i in range(6 + extra_columns))
+    parts.append("</tr></thead><tbody>")
+    filler = "<td>x</td>" * extra_columns
+    for n, row in enumerate(rows, start=1):
+        cells = "".join(f'<td class="s0">{cell}</td>' for cell in row)
+        parts.append(f'<tr><th class="row-header">{n}</th>{cells}{filler}</tr>')
+    parts.append("</tbody></table></div></body></html>")
+    return "".join(parts)
+
+
+def sheet_csv(symbol, rows):
+    return table_csv(sheet_rows(symbol, rows))
+
+
+def table_csv(rows):
+    return "".join(",".join(row) + "\r\n" for row in rows)
+
+
+class SheetServer:
+    """Threaded HTTP server on an ephemeral localhost port.
+
+    Use as a context manager; ``url(symbol, rows)`` builds request URLs and
+    ``requests`` counts every request received.
+    """
+
+    def __init__(self, delay=0.0, version="1"):
+        self.delay = delay
+        # Changing the version changes the ETag and the generated prices
+        self.version = version
+        # Extra rows appended to every sheet, to simulate new trading days
+        self.growth = 0
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._bodies = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}"
+
+    def url(self, symbol="TEST", rows=100, output="html"):
+        suffix = "&output=csv" if output == "csv" else ""
+        return f"{self.base_url}/{symbol}?rows={rows}{suffix}"
+
+    def _body(self, symbol, rows, output):
+        rows += self.growth
+        key = (symbol, rows, output, self.version)
+        if key not in self._bodies:
+            name = f"{symbol} v{self.version}" if self.version != "1" else symbol
+            text = sheet_csv(name, rows) if output == "csv" else sheet_html(name, rows)
+            self._bodies[key] = text.encode()
+        return self._bodies[key]
+
+    def _handle(self, handler):
+        with self._lock:
+            self.requests += 1
+        if self.delay:
+            time.sleep(self.delay)
+
+        parsed = urlparse(handler.path)
+        query = parse_qs(parsed.query)
+        symbol = parsed.path.strip("/") or "TEST"
+        if symbol == "missing":
+            handler.send_response(404)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+        rows = int(query.get("rows", ["100"])[0])
+        output = query.get("output", ["html"])[0]
+        body = self._body(symbol, rows, output)
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+        if handler.headers.get("If-None-Match") == etag:
+            with self._lock:
+                self.not_modified += 1
+            handler.send_response(304)
+            handler.send_header("ETag", etag)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+
+        handler.send_response(200)
+        content_type = "text/csv" if output == "csv" else "text/html"
+        handler.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        handler.send_header("ETag", etag)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
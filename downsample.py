@@ -0,0 +1,120 @@
+import numpy as np
+import plotly.graph_objects as go
+
+import profiling
+
+# Points sent to the browser per chart line unless the caller asks otherwise
+POINT_BUDGET = 2_000
+
+# Above this many points Plotly's WebGL trace renders far faster than SVG
+WEBGL_THRESHOLD = 5_000
+
+
+def _as_float(x):
+    # datetime64 and numeric x values both become float64 for the area maths
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb(x, y, budget=POINT_BUDGET):
+    """Largest-Triangle-Three-Buckets: indices of ``budget`` points that keep the shape.
+
+    The first and last points are always kept. In between, the series is cut
+    into ``budget - 2`` equal buckets and from each the point forming the
+    largest triangle with the previously chosen point and the next bucket's
+    average is picked, which preserves peaks and troughs.
+    """
+    n = len(y)
+    if budget >= n or budget < 3:
+        return np.arange(n)
+    xs = _as_float(x)
+    ys = np.asarray(y, dtype=np.float64)
+
+    # Bucket boundaries over the interior points 1 .. n-2
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.int64)
+    chosen = np.empty(budget, dtype=np.int64)
+    chosen[0] = 0
+    chosen[-1] = n - 1
+    previous = 0
+    for bucket in range(budget - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Average of the following bucket (or the final point)
+        next_start, next_end = end, edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = xs[next_start:next_end].mean()
+        avg_y = ys[next_start:next_end].mean()
+        px, py = xs[previous], ys[previous]
+        areas = np.abs((px - avg_x) * (ys[start:end] - py) - (px - xs[start:end]) * (avg_y - py))
+        previous = start + int(np.argmax(areas))
+        chosen[bucket + 1] = previous
+    return chosen
+
+
+def minmax(x, y, budget=POINT_BUDGET):
+    """Indices of the minimum and maximum of each of ``(budget - 2) // 2`` equal buckets.
+
+    Cheaper than LTTB and guarantees every extreme survives; the first and
+    last points are always kept.
+    """
+    n = len(y)
+    if budget >= n or budget < 4:
+        return np.arange(n)
+    ys = np.asarray(y, dtype=np.float64)
+    buckets = (budget - 2) // 2
+    usable = (n - 2) // buckets * buckets
+    blocks = ys[1:1 + usable].reshape(buckets, -1)
+    offsets = 1 + np.arange(buckets) * blocks.shape[1]
+    picked = np.concatenate([offsets + blocks.argmin(axis=1), offsets + blocks.argmax(axis=1)])
+    # Points left over after the last full bucket contribute their extremes too
+    tail = np.arange(1 + usable, n - 1)
+    if len(tail):
+        tail = tail[[ys[tail].argmin(), ys[tail].argmax()]]
+    return np.unique(np.concatenate([[0], picked, tail, [n - 1]]))
+
+
+METHODS = {
+    "lttb": lttb,
+    "minmax": minmax,
+}
+
+
+def downsample(df, x, y, budget=POINT_BUDGET, method="lttb"):
+    """Return ``df`` reduced to about ``budget`` rows chosen along ``x``/``y``.
+
+    ``df`` must already be sorted by ``x``; small frames are returned as is.
+    """
+    if len(df) <= budget:
+        return df
+    indices = METHODS[method](df[x].to_numpy(), df[y].to_numpy(), budget)
+    return df.iloc[indices]
+
+
+@profiling.timed("downsample.line_chart")
+def line_chart(df, x, y, title, budget=POINT_BUDGET, method="lttb"):
+    """A Plotly line figure of ``df`` downsampled to the point budget.
+
+    Series that stay above ``WEBGL_THRESHOLD`` points after downsampling are
+    drawn with WebGL (``Scattergl``).
+    """
+    points = downsample(df, x, y, budget, method)
+    trace = go.Scattergl if len(points) > WEBGL_THRESHOLD else go.Scatter
+    fig = go.Figure(trace(x=points[x], y=points[y], mode="lines", name=y))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+    return fig
+
+
+@profiling.timed("downsample.multi_line_chart")
+def multi_line_chart(df, x, y, group, title, budget=POINT_BUDGET, method="lttb"):
+    """One line per ``group`` value of the long-format ``df``, each downsampled on its own.
+
+    Every line gets the full point budget, and WebGL is used for all lines
+    once any of them stays above ``WEBGL_THRESHOLD`` points.
+    """
+    lines = [(name, downsample(rows, x, y, budget, method))
+             for name, rows in df.groupby(group, sort=False)]
+    trace = go.Scattergl if any(len(points) > WEBGL_THRESHOLD for _, points in lines) else go.Scatter
+    fig = go.Figure([trace(x=points[x], y=points[y], mode="lines", name=str(name))
+                     for name, points in lines])
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y, legend_title=group)
+    return fig
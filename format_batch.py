@@ -0,0 +1,214 @@
+"""Convert ``[Header]`` / ``{Section}`` formatted text files to HTML in parallel.
+
+Uses the same rules as the PythonRegex page (``text_formatter``). Files are
+spread over a process pool and streamed in chunks, so large inputs are
+never held in memory whole. Outputs are written to a temporary name and
+renamed once complete; a rerun skips every file whose output is newer than
+its input and was made with the same styles and mode (recorded in the
+page's head), so an interrupted run resumes where it stopped.
+
+Usage: python format_batch.py INPUT [INPUT ...] -o OUTPUT_DIR [--workers N] [--classes] [--force]
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import text_formatter
+
+# Characters read per chunk; the chunk is cut at its last line break
+CHUNK_SIZE = 1 << 20
+
+# Input files picked up when a directory is given
+PATTERN_SUFFIXES = (".txt",)
+
+# The PythonRegex sidebar defaults
+DEFAULT_STYLES = (
+    text_formatter.TextStyle("20px", "Arial", "#4CAF50"),
+    text_formatter.TextStyle("18px", "Arial", "#FF9800"),
+    text_formatter.TextStyle("14px", "Arial", "#000000"),
+)
+
+DOCUMENT_START = '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+DOCUMENT_BODY = "</head>\n<body>\n"
+DOCUMENT_HEAD = DOCUMENT_START + DOCUMENT_BODY
+# Batch outputs record the options they were made with, so a resumed run
+# with other options redoes them
+OPTIONS_META = '<meta name="format-options" content="{}">\n'
+DOCUMENT_TAIL = "\n</body>\n</html>\n"
+
+
+def html_document(body):
+    """Wrap formatted HTML in a standalone page."""
+    return DOCUMENT_HEAD + body + DOCUMENT_TAIL
+
+
+def options_head(styles, mode):
+    """Start of a batch output page, up to its options fingerprint."""
+    key = repr((tuple(tuple(style) for style in styles), mode))
+    return DOCUMENT_START + OPTIONS_META.format(hashlib.sha256(key.encode()).hexdigest()[:16])
+
+
+def iter_chunks(file, chunk_size=CHUNK_SIZE):
+    """Yield pieces of an open text file that each end on a line break.
+
+    Cutting after a line break keeps every line whole. A piece cut between
+    ``\\r`` and ``\\n`` adds only an empty line, which formats to nothing.
+    """
+    pending = ""
+    while True:
+        data = file.read(chunk_size)
+        if not data:
+            break
+        data = pending + data
+        cut = max(data.rfind("\n"), data.rfind("\r")) + 1
+        if cut:
+            pending = data[cut:]
+            yield data[:cut]
+        else:
+            pending = data  # No line break yet; keep reading
+    if pending:
+        yield pending
+
+
+def format_file(source, target, styles=DEFAULT_STYLES, mode=text_formatter.INLINE, chunk_size=CHUNK_SIZE):
+    """Format ``source`` into the HTML page ``target``; returns the input size in bytes."""
+    partial = target + ".part"
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    with open(source, encoding="utf-8", newline="") as src, open(partial, "w", encoding="utf-8") as dst:
+        dst.write(options_head(styles, mode) + DOCUMENT_BODY)
+        if mode == text_formatter.CLASSES:
+            dst.write(text_formatter.stylesheet(*styles) + "\n")
+        separator = ""
+        for chunk in iter_chunks(src, chunk_size):
+            html = text_formatter.format_body(chunk, *styles, mode)
+            if html:
+                dst.write(separator + html)
+                separator = "\n"
+        dst.write(DOCUMENT_TAIL)
+    # Only complete outputs get the final name, so a resumed run can trust them
+    os.replace(partial, target)
+    return os.path.getsize(source)
+
+
+def find_inputs(paths, output_dir):
+    """``(source, target)`` pairs for the given files and the text files under the given directories.
+
+    Raises ``ValueError`` if two different inputs would share an output.
+    """
+    pairs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.endswith(PATTERN_SUFFIXES):
+                        source = os.path.join(root, name)
+                        relative = os.path.relpath(source, path)
+                        pairs.append((source, os.path.join(output_dir, os.path.splitext(relative)[0] + ".html")))
+        else:
+            name = os.path.splitext(os.path.basename(path))[0] + ".html"
+            pairs.append((path, os.path.join(output_dir, name)))
+    return _check_targets(pairs)
+
+
+def _check_targets(pairs):
+    # An input named twice (a file and its directory, say) is formatted once;
+    # two different inputs that map to the same output are refused, since
+    # the second would silently overwrite the first.
+    sources, unique = {}, []
+    for source, target in pairs:
+        key = os.path.normcase(os.path.abspath(target))
+        if key not in sources:
+            sources[key] = source
+            unique.append((source, target))
+        elif os.path.realpath(sources[key]) != os.path.realpath(source):
+            raise ValueError(f"{sources[key]} and {source} would both be written to {target}")
+    return unique
+
+
+def up_to_date(source, target, head):
+    """Whether ``target`` is newer than ``source`` and starts with ``head`` (see ``options_head``)."""
+    try:
+        if os.stat(target).st_mtime_ns < os.stat(source).st_mtime_ns:
+            return False
+        with open(target, encoding="utf-8", newline="") as f:
+            return f.read(len(head)) == head
+    except (FileNotFoundError, UnicodeDecodeError):
+        return False
+
+
+class BatchSummary:
+    """Counts and timing of a ``run``; ``failed`` maps each failed input to its error."""
+
+    def __init__(self, formatted, skipped, failed, input_bytes, seconds):
+        self.formatted = formatted
+        self.skipped = skipped
+        self.failed = failed
+        self.input_bytes = input_bytes
+        self.seconds = seconds
+
+    @property
+    def files_per_second(self):
+        return self.formatted / self.seconds if self.seconds else 0.0
+
+    @property
+    def megabytes_per_second(self):
+        return self.input_bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+
+def run(paths, output_dir, styles=DEFAULT_STYLES, mode=text_formatter.INLINE, workers=None, force=False,
+        chunk_size=CHUNK_SIZE):
+    """Format every input under ``paths`` into ``output_dir`` across ``workers`` processes.
+
+    Files whose output is newer than the input and was made with the same
+    ``styles`` and ``mode`` are skipped unless ``force`` is set. A file that fails is recorded in the summary and the rest carry on.
+    """
+    start = time.perf_counter()
+    pairs = find_inputs(paths, output_dir)
+    head = options_head(styles, mode)
+    pending = [(source, target) for source, target in pairs if force or not up_to_date(source, target, head)]
+    formatted, input_bytes, failed = 0, 0, {}
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(format_file, source, target, styles, mode, chunk_size): source
+                       for source, target in pending}
+            for future in as_completed(futures):
+                try:
+                    input_bytes += future.result()
+                    formatted += 1
+                except Exception as e:
+                    failed[futures[future]] = f"{type(e).__name__}: {e}"
+    return BatchSummary(formatted, len(pairs) - len(pending), failed, input_bytes, time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="text files, or directories searched for *.txt")
+    parser.add_argument("-o", "--output-dir", required=True)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument("--classes", action="store_true", help="one <style> block instead of inline styles")
+    parser.add_argument("--force", action="store_true", help="reformat files whose output is up to date")
+    for kind, default in zip(("header", "section", "paragraph"), DEFAULT_STYLES):
+        parser.add_argument(f"--{kind}", nargs=3, metavar=("SIZE", "FAMILY", "COLOR"), default=list(default),
+                            help=f"{kind} style (default: {' '.join(default)})")
+    args = parser.parse_args(argv)
+
+    styles = tuple(text_formatter.TextStyle(*style) for style in (args.header, args.section, args.paragraph))
+    mode = text_formatter.CLASSES if args.classes else text_formatter.INLINE
+    try:
+        summary = run(args.inputs, args.output_dir, styles, mode, args.workers, args.force)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"Formatted {summary.formatted} files ({summary.input_bytes / 1e6:.1f} MB) in {summary.seconds:.2f} s: "
+          f"{summary.files_per_second:.1f} files/s, {summary.megabytes_per_second:.1f} MB/s; "
+          f"{summary.skipped} already up to date")
+    for source, error in summary.failed.items():
+        print(f"Failed {source}: {error}", file=sys.stderr)
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
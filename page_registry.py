@@ -0,0 +1,66 @@
+import importlib
+import os
+import threading
+
+# Directory holding the page scripts
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Page:
+    """A navigable page, declared by title and module name and loaded on first use.
+
+    Module pages are imported with ``importlib`` (so ``sys.modules`` caches
+    them) and render by calling ``entry``. Script pages (``entry=None``) are
+    standalone Streamlit scripts. They are compiled once and executed as
+    ``__main__`` on every rerun, the way ``streamlit run`` would execute them.
+    """
+
+    def __init__(self, title, module, entry="app"):
+        self.title = title
+        self.module = module
+        self.entry = entry
+
+
+PAGES = [
+    Page("Home", "home"),
+    Page("About", "about"),
+    Page("Contact", "contact"),
+    Page("Login", "auth", entry=None),
+    Page("Web Scraper", "webscraper", entry=None),
+    Page("Text Formatter", "PythonRegex", entry=None),
+    Page("Color Palettes", "colorstyle", entry=None),
+]
+
+_pages = {page.title: page for page in PAGES}
+
+# Script path -> (mtime_ns, code object); recompiled when the file changes
+_code = {}
+_lock = threading.Lock()
+
+
+def titles():
+    return list(_pages)
+
+
+def script_code(module):
+    """The compiled code of the script page ``module``."""
+    path = os.path.join(APP_DIR, module + ".py")
+    mtime = os.stat(path).st_mtime_ns
+    cached = _code.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, "rb") as f:
+            cached = (mtime, compile(f.read(), path, "exec"))
+        with _lock:
+            _code[path] = cached
+    return cached[1]
+
+
+def show(title):
+    """Render the page called ``title``, importing or compiling it first if needed."""
+    page = _pages[title]
+    if page.entry is None:
+        code = script_code(page.module)
+        # A fresh namespace per run, as for a script run by streamlit itself
+        exec(code, {"__name__": "__main__", "__file__": code.co_filename, "__builtins__": __builtins__})
+    else:
+        getattr(importlib.import_module(page.module), page.entry)()
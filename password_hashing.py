@@ -0,0 +1,133 @@
+import base64
+import hashlib
+import hmac
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import profiling
+
+# scrypt work runs on a bounded pool so a burst of logins cannot pin every
+# core (or allocate unbounded memory) at once. hashlib releases the GIL while
+# deriving, so threads are enough here.
+HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Calibration aims for this much wall time per hash on the current host
+TARGET_MS = float(os.environ.get("PASSWORD_HASH_TARGET_MS", "50"))
+
+# scrypt cost bounds: N is doubled from MIN_N until the target is reached
+MIN_N = 2 ** 12
+MAX_N = 2 ** 20
+BLOCK_SIZE = 8
+PARALLELISM = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+SCHEME = "scrypt"
+LEGACY_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
+_params = None
+_params_lock = threading.Lock()
+
+
+def _b64encode(data):
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(text):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _derive(password, salt, n, r, p):
+    # Allow scrypt the memory it needs for large N (128 * r * N bytes) plus headroom
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * r * n + 1024 * 1024, dklen=KEY_BYTES)
+
+
+def calibrate(target_ms=TARGET_MS, r=BLOCK_SIZE, p=PARALLELISM):
+    """Return the ``(n, r, p)`` whose derivation time first reaches ``target_ms``."""
+    salt = os.urandom(SALT_BYTES)
+    n = MIN_N
+    while n < MAX_N:
+        start = time.perf_counter()
+        _derive("calibration", salt, n, r, p)
+        if (time.perf_counter() - start) * 1000 >= target_ms:
+            break
+        n *= 2
+    return n, r, p
+
+
+def get_params():
+    """Cost parameters for new hashes, calibrated once per process.
+
+    Setting PASSWORD_HASH_N skips calibration, e.g. to keep cost identical
+    across hosts.
+    """
+    global _params
+    if _params is None:
+        with _params_lock:
+            if _params is None:
+                fixed_n = os.environ.get("PASSWORD_HASH_N")
+                if fixed_n:
+                    _params = (int(fixed_n), BLOCK_SIZE, PARALLELISM)
+                else:
+                    _params = calibrate()
+    return _params
+
+
+def _hash(password):
+    n, r, p = get_params()
+    salt = os.urandom(SALT_BYTES)
+    key = _derive(password, salt, n, r, p)
+    return f"{SCHEME}${n}${r}${p}${_b64encode(salt)}${_b64encode(key)}"
+
+
+def _verify(password, stored):
+    if LEGACY_SHA256.match(stored):
+        candidate = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(candidate, stored)
+    try:
+        scheme, n, r, p, salt, key = stored.split("$")
+        if scheme != SCHEME:
+            return False
+        expected = _b64decode(key)
+        derived = _derive(password, _b64decode(salt), int(n), int(r), int(p))
+    except ValueError:
+        # Malformed hash strings never verify
+        return False
+    return hmac.compare_digest(derived, expected)
+
+
+def submit_hash(password):
+    """Hash on the worker pool and return a Future for the encoded string."""
+    return _executor.submit(_hash, password)
+
+
+def submit_verify(password, stored):
+    return _executor.submit(_verify, password, stored)
+
+
+@profiling.timed("password_hashing.hash_password")
+def hash_password(password):
+    """Return a versioned ``scrypt$N$r$p$salt$key`` string for ``password``."""
+    return submit_hash(password).result()
+
+
+@profiling.timed("password_hashing.verify_password")
+def verify_password(password, stored):
+    """Check ``password`` against a scrypt or legacy SHA-256 hash in constant time."""
+    return submit_verify(password, stored).result()
+
+
+def needs_rehash(stored):
+    """True when ``stored`` is a legacy hash or uses a lower cost than current."""
+    if LEGACY_SHA256.match(stored):
+        return True
+    try:
+        scheme, n, _, _, _, _ = stored.split("$")
+        return scheme != SCHEME or int(n) < get_params()[0]
+    except ValueError:
+        return True
@@ -0,0 +1,189 @@
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import profiling
+import sheet_frame
+import user_store
+
+# SQLite file holding refreshed sheet data, separate from the user database
+DB_PATH = os.environ.get("PRICES_DB_PATH", "prices.db")
+
+# Sheets nobody has fetched or viewed for this long (seconds) stop being
+# refreshed and their stored rows are deleted
+IDLE_SECONDS = float(os.environ.get("SHEET_IDLE_SECONDS", str(24 * 3600)))
+# Views are recorded at most this often per sheet, so page reruns rarely write
+VIEW_GRANULARITY = 60.0
+
+
+def _create_tables(cursor):
+    # Tracked sheets, the outcome of their latest refresh and when a page
+    # last used them
+    cursor.execute('''CREATE TABLE IF NOT EXISTS sheets (
+                    url TEXT PRIMARY KEY,
+                    symbol TEXT,
+                    columns TEXT,
+                    last_refresh REAL,
+                    last_success REAL,
+                    last_error TEXT,
+                    refresh_seconds REAL,
+                    last_viewed REAL)''')
+    # One row per sheet URL and timestamp (seconds since the epoch); sheets
+    # sharing a stock name stay separate. The other sheet columns are kept
+    # as a JSON list in the sheet's column order.
+    cursor.execute('''CREATE TABLE IF NOT EXISTS prices (
+                    url TEXT NOT NULL,
+                    ts INTEGER NOT NULL,
+                    close REAL NOT NULL,
+                    cells TEXT NOT NULL,
+                    PRIMARY KEY (url, ts)) WITHOUT ROWID''')
+
+
+MIGRATIONS = [
+    (1, _create_tables),
+]
+
+
+def _connection(path):
+    path = path or DB_PATH
+    user_store.ensure_schema(path, MIGRATIONS)
+    return user_store.get_pool(path).connection()
+
+
+def can_store(frame):
+    """Whether ``frame`` has the Date and Close columns rows are stored by."""
+    return sheet_frame.DATE_COLUMN in frame and sheet_frame.CLOSE_COLUMN in frame
+
+
+def track(url, path=None):
+    """Add ``url`` to the tracked sheets; returns False if it was already tracked."""
+    with _connection(path) as conn:
+        added = conn.execute("INSERT OR IGNORE INTO sheets (url, last_viewed) VALUES (?, ?)",
+                             (url, time.time())).rowcount > 0
+    if not added:
+        viewed(url, path)
+    return added
+
+
+def untrack(url, path=None):
+    """Stop tracking ``url`` and delete its stored rows."""
+    with _connection(path) as conn:
+        conn.execute("DELETE FROM sheets WHERE url = ?", (url,))
+        conn.execute("DELETE FROM prices WHERE url = ?", (url,))
+
+
+def viewed(url, path=None):
+    """Record that a page used ``url``, keeping it tracked for another ``IDLE_SECONDS``."""
+    now = time.time()
+    with _connection(path) as conn:
+        conn.execute("UPDATE sheets SET last_viewed = ? WHERE url = ? AND last_viewed < ?",
+                     (now, url, now - VIEW_GRANULARITY))
+
+
+def expire_idle(idle_seconds=IDLE_SECONDS, now=None, path=None):
+    """Untrack sheets not viewed for ``idle_seconds``; returns their URLs."""
+    cutoff = (time.time() if now is None else now) - idle_seconds
+    with _connection(path) as conn:
+        urls = [url for url, in conn.execute("SELECT url FROM sheets WHERE last_viewed < ?", (cutoff,))]
+        conn.executemany("DELETE FROM prices WHERE url = ?", ((url,) for url in urls))
+        conn.executemany("DELETE FROM sheets WHERE url = ?", ((url,) for url in urls))
+    return urls
+
+
+def tracked_sheets(path=None):
+    """Rows of ``(url, symbol, last_refresh, last_success, last_error, refresh_seconds)``."""
+    with _connection(path) as conn:
+        return conn.execute("SELECT url, symbol, last_refresh, last_success, last_error, refresh_seconds "
+                            "FROM sheets ORDER BY url").fetchall()
+
+
+def record_refresh(url, started, symbol=None, columns=None, error=None, path=None):
+    """Store the outcome of a refresh attempt that began at ``started``."""
+    now = time.time()
+    with _connection(path) as conn:
+        if error is None:
+            conn.execute("UPDATE sheets SET symbol = ?, columns = ?, last_refresh = ?, last_success = ?, "
+                         "last_error = NULL, refresh_seconds = ? WHERE url = ?",
+                         (symbol, json.dumps(columns), now, now, now - started, url))
+        else:
+            conn.execute("UPDATE sheets SET last_refresh = ?, last_error = ?, refresh_seconds = ? "
+                         "WHERE url = ?", (now, error, now - started, url))
+
+
+def latest_timestamp(url, path=None):
+    with _connection(path) as conn:
+        return conn.execute("SELECT MAX(ts) FROM prices WHERE url = ?", (url,)).fetchone()[0]
+
+
+@profiling.timed("price_store.append")
+def append(url, frame, path=None):
+    """Append the rows of ``frame`` newer than what is stored for the sheet at ``url``.
+
+    ``frame`` is a cleaned, date-sorted table from ``sheet_frame``. Rows at or
+    before the newest stored timestamp are skipped, so repeated refreshes
+    of an unchanged sheet write nothing. Returns the number of rows added.
+    """
+    if not can_store(frame):
+        raise ValueError("Only sheets with Date and Close columns can be stored.")
+    stamps = frame[sheet_frame.DATE_COLUMN].to_numpy().astype("datetime64[s]").astype(np.int64)
+    newest = latest_timestamp(url, path)
+    fresh = np.flatnonzero(stamps > newest) if newest is not None else np.arange(len(stamps))
+    if not len(fresh):
+        return 0
+
+    closes = frame[sheet_frame.CLOSE_COLUMN].to_numpy()
+    others = [name for name in frame.columns
+              if name not in (sheet_frame.DATE_COLUMN, sheet_frame.CLOSE_COLUMN)]
+    cells = frame[others].to_numpy(dtype=object)
+    rows = ((url, int(stamps[i]), float(closes[i]), json.dumps(cells[i].tolist(), default=str))
+            for i in fresh)
+    with _connection(path) as conn:
+        # Sheets can repeat a timestamp; the first occurrence wins
+        cursor = conn.executemany("INSERT OR IGNORE INTO prices (url, ts, close, cells) VALUES (?, ?, ?, ?)",
+                                  rows)
+        return cursor.rowcount
+
+
+def _dates(stamps):
+    return np.array(stamps, dtype=np.int64).astype("datetime64[s]").astype("datetime64[ns]")
+
+
+@profiling.timed("price_store.load_prices")
+def load_prices(url, path=None):
+    """Date/Close history of the sheet at ``url`` in date order, straight from the index."""
+    with _connection(path) as conn:
+        rows = conn.execute("SELECT ts, close FROM prices WHERE url = ? ORDER BY ts",
+                            (url,)).fetchall()
+    stamps, closes = zip(*rows) if rows else ((), ())
+    return pd.DataFrame({sheet_frame.DATE_COLUMN: _dates(stamps),
+                         sheet_frame.CLOSE_COLUMN: np.array(closes, dtype=np.float64)})
+
+
+@profiling.timed("price_store.latest_rows")
+def latest_rows(url, columns, count=5, path=None):
+    """The newest ``count`` rows of the sheet at ``url`` with every column, oldest first."""
+    with _connection(path) as conn:
+        rows = conn.execute("SELECT ts, close, cells FROM prices WHERE url = ? ORDER BY ts DESC LIMIT ?",
+                            (url, count)).fetchall()[::-1]
+    others = [name for name in columns
+              if name not in (sheet_frame.DATE_COLUMN, sheet_frame.CLOSE_COLUMN)]
+    frame = pd.DataFrame([json.loads(cells) for _, _, cells in rows], columns=others)
+    typed = {
+        sheet_frame.DATE_COLUMN: _dates([row[0] for row in rows]),
+        sheet_frame.CLOSE_COLUMN: np.array([row[1] for row in rows], dtype=np.float64),
+    }
+    for name in sorted(typed, key=columns.index):
+        frame.insert(columns.index(name), name, typed[name])
+    return frame
+
+
+def sheet_columns(url, path=None):
+    """``(symbol, columns)`` recorded by the last successful refresh of ``url``."""
+    with _connection(path) as conn:
+        row = conn.execute("SELECT symbol, columns FROM sheets WHERE url = ?", (url,)).fetchone()
+    if row is None or row[0] is None:
+        return None, None
+    return row[0], json.loads(row[1])
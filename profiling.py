@@ -0,0 +1,72 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Active collector: span name -> [count, total seconds, max seconds], or None
+# when nothing is collecting. Spans cost a single global check while off.
+_spans = None
+_lock = threading.Lock()
+
+
+def _record(name, elapsed):
+    with _lock:
+        if _spans is None:
+            return
+        entry = _spans.get(name)
+        if entry is None:
+            _spans[name] = [1, elapsed, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] = max(entry[2], elapsed)
+
+
+@contextmanager
+def span(name):
+    """Time the enclosed block under ``name`` while a collector is active."""
+    if _spans is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+def timed(name):
+    """Decorator recording every call of the function as a span called ``name``."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _spans is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def collect():
+    """Collect spans from every thread for the duration of the block.
+
+    Yields a dict that is filled in when the block exits:
+    ``{name: {"count": n, "total_ms": ..., "max_ms": ...}}``.
+    """
+    global _spans
+    spans = {}
+    results = {}
+    with _lock:
+        _spans = spans
+    try:
+        yield results
+    finally:
+        with _lock:
+            _spans = None
+        results.update((name, {"count": count, "total_ms": total * 1000, "max_ms": longest * 1000})
+                       for name, (count, total, longest) in sorted(spans.items()))
@@ -0,0 +1,172 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import user_store
+
+# Token buckets: a burst of BURST attempts, then PER_MINUTE attempts a minute
+USER_BURST = int(os.environ.get("LOGIN_USER_BURST", "5"))
+USER_PER_MINUTE = float(os.environ.get("LOGIN_USER_PER_MINUTE", "5"))
+SESSION_BURST = int(os.environ.get("LOGIN_SESSION_BURST", "10"))
+SESSION_PER_MINUTE = float(os.environ.get("LOGIN_SESSION_PER_MINUTE", "10"))
+# Ceiling across all sessions and usernames, bounding the database and
+# hashing work a flood from many sessions can cause
+GLOBAL_BURST = int(os.environ.get("LOGIN_GLOBAL_BURST", "100"))
+GLOBAL_PER_MINUTE = float(os.environ.get("LOGIN_GLOBAL_PER_MINUTE", "3000"))
+
+# Consecutive failed logins that lock a username, and for how long (seconds)
+LOCKOUT_THRESHOLD = int(os.environ.get("LOGIN_LOCKOUT_THRESHOLD", "10"))
+LOCKOUT_SECONDS = float(os.environ.get("LOGIN_LOCKOUT_SECONDS", "900"))
+# Keep lockouts in the user database so they survive a restart
+PERSIST_LOCKOUTS = os.environ.get("LOGIN_LOCKOUT_PERSIST", "1") == "1"
+
+# Keys remembered per store; the least recently used are dropped beyond this
+MAX_KEYS = int(os.environ.get("LOGIN_RATE_LIMIT_MAX_KEYS", "100000"))
+
+
+class TTLStore:
+    """Bounded mapping whose entries expire ``ttl`` seconds after their last write.
+
+    Entries are kept in write order, so expired ones are always at the
+    front and are evicted as new writes arrive. Beyond ``max_size`` the
+    least recently written entry is dropped. Not thread-safe; callers lock.
+    """
+
+    def __init__(self, ttl, max_size=MAX_KEYS):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None or now - entry[0] >= self.ttl:
+            return None
+        return entry[1]
+
+    def put(self, key, value, now):
+        self._entries[key] = (now, value)
+        self._entries.move_to_end(key)
+        while self._entries:
+            written, _ = next(iter(self._entries.values()))
+            if now - written < self.ttl and len(self._entries) <= self.max_size:
+                break
+            self._entries.popitem(last=False)
+
+    def pop(self, key):
+        self._entries.pop(key, None)
+
+
+class TokenBuckets:
+    """One token bucket per key: ``burst`` tokens, refilled at ``per_minute`` a minute.
+
+    A bucket left alone long enough to refill completely is the same as a
+    new one, so that is its TTL in the underlying ``TTLStore``.
+    """
+
+    def __init__(self, burst, per_minute, max_size=MAX_KEYS):
+        self.burst = burst
+        self.rate = per_minute / 60.0
+        self.store = TTLStore(burst / self.rate, max_size)
+
+    def take(self, key, now):
+        """Spend a token for ``key``; returns 0 if allowed, else the seconds until one is available."""
+        entry = self.store.get(key, now)
+        tokens = self.burst if entry is None else min(self.burst, entry[0] + (now - entry[1]) * self.rate)
+        if tokens < 1:
+            return (1 - tokens) / self.rate
+        self.store.put(key, (tokens - 1, now), now)
+        return 0.0
+
+
+class LoginThrottle:
+    """Per-username, per-session and process-wide login rate limits plus username lockouts.
+
+    ``check`` only touches memory, so rejected attempts cost no database
+    read and no password hash. After ``lockout_threshold`` consecutive
+    failures a username is locked for ``lockout_seconds``. With ``persist``
+    the lockout is also written to the user database and loaded again by
+    the next process.
+    """
+
+    def __init__(self, user_burst=USER_BURST, user_per_minute=USER_PER_MINUTE, session_burst=SESSION_BURST,
+                 session_per_minute=SESSION_PER_MINUTE, global_burst=GLOBAL_BURST,
+                 global_per_minute=GLOBAL_PER_MINUTE, lockout_threshold=LOCKOUT_THRESHOLD,
+                 lockout_seconds=LOCKOUT_SECONDS, persist=PERSIST_LOCKOUTS, path=None, max_keys=MAX_KEYS,
+                 clock=time.time):
+        self.users = TokenBuckets(user_burst, user_per_minute, max_keys)
+        self.sessions = TokenBuckets(session_burst, session_per_minute, max_keys)
+        self.overall = TokenBuckets(global_burst, global_per_minute, 1)
+        self.failures = TTLStore(lockout_seconds, max_keys)
+        self.lockouts = TTLStore(lockout_seconds, max_keys)
+        self.lockout_threshold = lockout_threshold
+        self.lockout_seconds = lockout_seconds
+        self.persist = persist
+        self.path = path
+        self.clock = clock
+        self._loaded = not persist
+        self._lock = threading.Lock()
+
+    def _load_lockouts(self, now):
+        # Lockouts written by an earlier process, read once
+        self._loaded = True
+        try:
+            user_store.ensure_schema(self.path)
+            for username, locked_until in user_store.active_lockouts(now, self.path).items():
+                self.lockouts.put(username, locked_until, now)
+        except sqlite3.Error:
+            pass  # Rate limits still apply; only earlier lockouts are lost
+
+    def check(self, username, session):
+        """Return 0 if a login attempt may proceed, else the seconds to wait."""
+        now = self.clock()
+        with self._lock:
+            if not self._loaded:
+                self._load_lockouts(now)
+            locked_until = self.lockouts.get(username, now)
+            if locked_until is not None and locked_until > now:
+                return locked_until - now
+            # The session pays first, so one client spraying usernames can't
+            # drain other users' buckets beyond its own allowance
+            return (self.sessions.take(session, now) or self.users.take(username, now)
+                    or self.overall.take(None, now))
+
+    def failed(self, username):
+        """Record a failed login; returns True if it locked the username."""
+        now = self.clock()
+        with self._lock:
+            count = (self.failures.get(username, now) or 0) + 1
+            if count < self.lockout_threshold:
+                self.failures.put(username, count, now)
+                return False
+            self.failures.pop(username)
+            locked_until = now + self.lockout_seconds
+            self.lockouts.put(username, locked_until, now)
+        if self.persist:
+            try:
+                user_store.save_lockout(username, locked_until, self.path)
+            except sqlite3.Error:
+                pass  # Still locked in memory for this process
+        return True
+
+    def succeeded(self, username):
+        with self._lock:
+            self.failures.pop(username)
+
+
+# Shared throttle so limits apply across every session of the process
+_throttle = None
+_throttle_lock = threading.Lock()
+
+
+def get_throttle():
+    global _throttle
+    if _throttle is None:
+        with _throttle_lock:
+            if _throttle is None:
+                _throttle = LoginThrottle()
+    return _throttle
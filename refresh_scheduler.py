@@ -0,0 +1,139 @@
+import threading
+import time
+
+import price_store
+import profiling
+import sheet_fetch
+import sheet_source
+
+# Seconds between refreshes of each tracked sheet
+REFRESH_INTERVAL = 300.0
+
+# How often the worker wakes up to look for sheets that are due
+TICK = 1.0
+
+
+class RefreshScheduler:
+    """Background worker that keeps tracked sheets fresh in the price store.
+
+    Every ``interval`` seconds each tracked sheet is revalidated through a
+    dedicated fetcher (an unchanged sheet costs one 304 and no parsing) and
+    rows newer than the stored ones are appended. Pages then read the store
+    and never touch the network. Sheets no page has used for
+    ``idle_seconds`` are untracked.
+    """
+
+    def __init__(self, interval=REFRESH_INTERVAL, tick=TICK, store_path=None, fetcher=None,
+                 idle_seconds=price_store.IDLE_SECONDS):
+        self.interval = interval
+        self.idle_seconds = idle_seconds
+        self.tick = tick
+        self.store_path = store_path
+        # ttl=0: every refresh revalidates, but 304s reuse the parsed table
+        self.fetcher = fetcher or sheet_fetch.SheetFetcher(ttl=0)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._refreshing = set()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="sheet-refresh", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_due()
+            self._stop.wait(self.tick)
+
+    def track(self, url):
+        """Track ``url``; returns False if it was already tracked."""
+        return price_store.track(url, self.store_path)
+
+    def untrack(self, url):
+        price_store.untrack(url, self.store_path)
+
+    def refresh_due(self, now=None):
+        """Drop idle sheets, then refresh every tracked sheet whose interval has elapsed."""
+        now = time.time() if now is None else now
+        price_store.expire_idle(self.idle_seconds, now, self.store_path)
+        for url, _, last_refresh, _, _, _ in price_store.tracked_sheets(self.store_path):
+            if last_refresh is None or now - last_refresh >= self.interval:
+                self.refresh(url)
+
+    @profiling.timed("refresh_scheduler.RefreshScheduler.refresh")
+    def refresh(self, url, raise_errors=False):
+        """Fetch ``url`` now and append its new rows; returns the number added.
+
+        Errors are recorded against the sheet, and only re-raised when
+        ``raise_errors`` is set, so one bad sheet does not stop the others.
+        A refresh already running for the same URL is not started twice.
+        """
+        with self._lock:
+            if url in self._refreshing:
+                return 0
+            self._refreshing.add(url)
+        started = time.time()
+        try:
+            sheet = sheet_source.load_sheet(url, self.fetcher)
+            return self._store(url, sheet, started)
+        except Exception as e:
+            price_store.record_refresh(url, started, error=str(e) or type(e).__name__,
+                                       path=self.store_path)
+            if raise_errors:
+                raise
+            return 0
+        finally:
+            with self._lock:
+                self._refreshing.discard(url)
+
+    def _store(self, url, sheet, started):
+        added = price_store.append(url, sheet.frame, self.store_path)
+        price_store.record_refresh(url, started, sheet.stock_name, list(sheet.frame.columns),
+                                   path=self.store_path)
+        return added
+
+    def add(self, url, sheet):
+        """Track ``url`` and store ``sheet``, just loaded from it; returns the rows added.
+
+        Pages load a sheet once to see whether it can be stored at all, and
+        hand it over here instead of fetching it a second time.
+        """
+        started = time.time()
+        newly_tracked = self.track(url)
+        try:
+            return self._store(url, sheet, started)
+        except Exception:
+            # Don't keep polling a sheet that never stored
+            if newly_tracked:
+                self.untrack(url)
+            raise
+
+    def refresh_lag(self, now=None):
+        """Seconds since each tracked sheet last refreshed successfully (None if never)."""
+        now = time.time() if now is None else now
+        return {url: None if last_success is None else now - last_success
+                for url, _, _, last_success, _, _ in price_store.tracked_sheets(self.store_path)}
+
+
+# One scheduler per process, shared by every session
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """The process-wide scheduler, started on first use."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = RefreshScheduler().start()
+    return _scheduler
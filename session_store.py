@@ -0,0 +1,113 @@
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+import user_store
+
+# How long a login session lasts, in seconds
+SESSION_LIFETIME = float(os.environ.get("SESSION_LIFETIME_SECONDS", str(7 * 24 * 3600)))
+
+# Sessions kept per process; the least recently used ones are dropped first
+MAX_SESSIONS = int(os.environ.get("SESSION_MAX_COUNT", "10000"))
+# Roles are re-read from the user database after this many seconds, so
+# changes made by other processes show up within that time
+ROLE_TTL = float(os.environ.get("SESSION_ROLE_TTL", "60"))
+
+
+class SessionStore:
+    """Server-side login sessions, keyed by an unguessable session id.
+
+    The id lives in the browser session's state only, never in the page,
+    so a reload logs the user out. ``lookup`` runs on every rerun and
+    revalidates the role: it is re-read from ``users`` at most every
+    ``role_ttl`` seconds, ``set_role`` applies at once, and a deleted user's
+    sessions end on their next rerun.
+    """
+
+    def __init__(self, path=None, lifetime=SESSION_LIFETIME, max_sessions=MAX_SESSIONS, role_ttl=ROLE_TTL,
+                 clock=time.monotonic):
+        self.path = path
+        self.lifetime = lifetime
+        self.max_sessions = max_sessions
+        self.role_ttl = role_ttl
+        self.clock = clock
+        # session id -> (username, expires); username -> [role checked at, role, session ids]
+        self._sessions = OrderedDict()
+        self._users = {}
+        self._lock = threading.Lock()
+
+    def create(self, username, role):
+        """Start a session for ``username`` and return its id."""
+        session_id = secrets.token_urlsafe(24)
+        now = self.clock()
+        with self._lock:
+            self._sessions[session_id] = (username, now + self.lifetime)
+            user = self._users.setdefault(username, [now, role, set()])
+            user[:2] = now, role
+            user[2].add(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._drop(next(iter(self._sessions)))
+        return session_id
+
+    def lookup(self, session_id):
+        """``(username, role)`` for a live session, else ``None``."""
+        now = self.clock()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            username, expires = entry
+            if expires <= now:
+                self._drop(session_id)
+                return None
+            self._sessions.move_to_end(session_id)
+            checked, role, _ = self._users[username]
+            if now - checked < self.role_ttl:
+                return username, role
+        role = user_store.get_role(username, self.path)
+        with self._lock:
+            user = self._users.get(username)
+            if role is None:
+                # The account is gone; so are its sessions
+                for other in list(user[2] if user else ()):
+                    self._drop(other)
+                return None
+            if user is not None:
+                user[:2] = now, role
+        return username, role
+
+    def revoke(self, session_id):
+        with self._lock:
+            self._drop(session_id)
+
+    def set_role(self, username, role):
+        """Change a user's role; their sessions pick it up on the next rerun."""
+        user_store.update_role(username, role, self.path)
+        with self._lock:
+            user = self._users.get(username)
+            if user is not None:
+                user[:2] = self.clock(), role
+
+    def _drop(self, session_id):
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            sessions = self._users[entry[0]][2]
+            sessions.discard(session_id)
+            if not sessions:
+                del self._users[entry[0]]
+
+
+# Shared store so every browser session of the process sees the same sessions
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SessionStore()
+    return _store
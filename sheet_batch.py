@@ -0,0 +1,114 @@
+import multiprocessing
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+import requests
+
+import profiling
+import sheet_fetch
+import sheet_frame
+import sheet_source
+
+# Requests in flight at once across a batch
+MAX_CONCURRENCY = 8
+
+# Processes parsing downloaded sheets; 0 parses on the fetching threads
+PARSE_WORKERS = min(4, multiprocessing.cpu_count())
+
+SYMBOL_COLUMN = "Symbol"
+
+# Parse pool shared by every batch; workers are started once and reused.
+# Spawned rather than forked because the Streamlit server is multithreaded.
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def _get_parse_pool(workers):
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=workers,
+                                              mp_context=multiprocessing.get_context("spawn"))
+        return _parse_pool
+
+
+class BatchResult:
+    """Outcome of ``fetch_batch``.
+
+    ``frame`` is the long-format table of every sheet that loaded (Symbol,
+    Date, Close), ``sheets`` maps those URLs to their ``SheetTable`` and
+    ``errors`` maps each URL that failed to a readable message. Symbols are
+    unique per sheet: stock names shared by several sheets get a ``(1)``,
+    ``(2)``, ... suffix in URL order.
+    """
+
+    def __init__(self, frame, sheets, errors):
+        self.frame = frame
+        self.sheets = sheets
+        self.errors = errors
+
+
+def _describe(error):
+    if isinstance(error, LookupError):
+        return "No table found on the page."
+    if isinstance(error, requests.RequestException):
+        return f"Failed to fetch the sheet: {error}"
+    return f"{type(error).__name__}: {error}"
+
+
+def _symbols(sheets):
+    # One label per URL; each series must stay separate and date-sorted for
+    # the chart, so sheets sharing a stock name (every unnamed sheet is
+    # "Unknown Stock") are numbered
+    counts = Counter(sheet.stock_name for sheet in sheets.values())
+    seen = Counter()
+    symbols = {}
+    for url, sheet in sheets.items():
+        name = sheet.stock_name
+        if counts[name] > 1:
+            seen[name] += 1
+            name = f"{name} ({seen[name]})"
+        symbols[url] = name
+    return symbols
+
+
+@profiling.timed("sheet_batch.fetch_batch")
+def fetch_batch(urls, max_concurrency=MAX_CONCURRENCY, parse_workers=PARSE_WORKERS, fetcher=None):
+    """Fetch and parse many sheets concurrently and combine them.
+
+    At most ``max_concurrency`` downloads run at once. Each sheet is parsed
+    in the shared process pool as soon as its download finishes, overlapping
+    with the remaining downloads. A failing URL is reported in ``errors``
+    without affecting the rest of the batch.
+    """
+    fetcher = fetcher or sheet_fetch.get_fetcher()
+    pool = _get_parse_pool(parse_workers) if parse_workers else None
+    urls = list(dict.fromkeys(urls))  # drop duplicates, keep order
+
+    sheets, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="sheet-batch") as executor:
+        submit = pool.submit if pool is not None else None
+        futures = {url: executor.submit(sheet_source.load_sheet, url, fetcher, submit) for url in urls}
+        for url, future in futures.items():
+            try:
+                sheets[url] = future.result()
+            except Exception as e:
+                errors[url] = _describe(e)
+
+    for url, sheet in sheets.items():
+        if sheet_frame.DATE_COLUMN not in sheet.frame or sheet_frame.CLOSE_COLUMN not in sheet.frame:
+            errors[url] = "The sheet has no Date and Close columns."
+    for url in errors:
+        sheets.pop(url, None)
+
+    parts = []
+    for url, symbol in _symbols(sheets).items():
+        part = sheets[url].frame[[sheet_frame.DATE_COLUMN, sheet_frame.CLOSE_COLUMN]].reset_index(drop=True)
+        part.insert(0, SYMBOL_COLUMN, symbol)
+        parts.append(part)
+
+    columns = [SYMBOL_COLUMN, sheet_frame.DATE_COLUMN, sheet_frame.CLOSE_COLUMN]
+    combined = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns)
+    return BatchResult(combined, sheets, errors)
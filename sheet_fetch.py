@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import profiling
+
+# Defaults for the shared fetcher; each can be overridden per SheetFetcher
+TIMEOUT = 10.0          # seconds, applied to both connect and read
+RETRIES = 3             # retries on connection errors and 429/5xx responses
+BACKOFF = 0.5           # exponential backoff factor between retries (seconds)
+POOL_SIZE = 10          # keep-alive connections kept per host
+CACHE_SIZE = 64         # responses kept in the LRU cache
+CACHE_TTL = 60.0        # seconds a cached response is served without revalidation
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CachedResponse:
+    """A fetched document plus the validators needed to revalidate it."""
+
+    def __init__(self, url, text, etag=None, last_modified=None):
+        self.url = url
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.monotonic()
+        # Parsed forms of ``text``, keyed by parser name, reused until the body changes
+        self.parsed = {}
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of ``CachedResponse`` keyed by URL."""
+
+    def __init__(self, max_size=CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def put(self, entry):
+        with self._lock:
+            self._entries[entry.url] = entry
+            self._entries.move_to_end(entry.url)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def make_session(pool_size=POOL_SIZE, retries=RETRIES, backoff=BACKOFF):
+    """A ``requests.Session`` with keep-alive pooling and retry with backoff."""
+    retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+                  allowed_methods=frozenset({"GET", "HEAD"}), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class SheetFetcher:
+    """Fetch documents over a pooled session with a TTL + LRU response cache.
+
+    Within ``ttl`` a cached response is returned without any network I/O.
+    After that the request is revalidated with If-None-Match /
+    If-Modified-Since, and a 304 reuses the cached body together with
+    everything already parsed from it.
+    """
+
+    def __init__(self, timeout=TIMEOUT, retries=RETRIES, backoff=BACKOFF, pool_size=POOL_SIZE,
+                 cache_size=CACHE_SIZE, ttl=CACHE_TTL, session=None):
+        self.timeout = timeout
+        self.ttl = ttl
+        self.session = session or make_session(pool_size, retries, backoff)
+        self.cache = ResponseCache(cache_size)
+
+    @profiling.timed("sheet_fetch.SheetFetcher.get")
+    def get(self, url):
+        """Return the ``CachedResponse`` for ``url``, raising ``requests.RequestException`` on failure."""
+        entry = self.cache.get(url)
+        if entry is not None and time.monotonic() - entry.fetched_at < self.ttl:
+            return entry
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and entry is not None:
+            entry.fetched_at = time.monotonic()
+            self.cache.put(entry)
+            return entry
+        if response.status_code != 200:
+            raise requests.HTTPError(f"{response.status_code} response from {url}", response=response)
+
+        entry = CachedResponse(url, response.text, response.headers.get("ETag"),
+                               response.headers.get("Last-Modified"))
+        self.cache.put(entry)
+        return entry
+
+    def get_parsed(self, url, parse, submit=None):
+        """Fetch ``url`` and return ``parse(text)``, parsing only when the body changed.
+
+        ``submit``, an executor's ``submit``, runs the parse elsewhere (a
+        process pool, say); by default it runs on the calling thread.
+        """
+        entry = self.get(url)
+        # Keyed by name rather than identity: page scripts redefine their
+        # functions on every rerun
+        key = f"{parse.__module__}.{parse.__qualname__}"
+        if key not in entry.parsed:
+            entry.parsed[key] = parse(entry.text) if submit is None else submit(parse, entry.text).result()
+        return entry.parsed[key]
+
+
+# Shared fetcher so every rerun and session reuses connections and cache
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_fetcher():
+    global _fetcher
+    if _fetcher is None:
+        with _fetcher_lock:
+            if _fetcher is None:
+                _fetcher = SheetFetcher()
+    return _fetcher
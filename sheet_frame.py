@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+import profiling
+
+DATE_COLUMN = "Date"
+CLOSE_COLUMN = "Close"
+
+# Formats numpy can parse natively, much faster than pandas' object path
+ISO_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S")
+
+# Range representable as datetime64[ns]; pandas turns anything outside into NaT
+_NS_MIN = np.datetime64(pd.Timestamp.min.ceil("s"), "s")
+_NS_MAX = np.datetime64(pd.Timestamp.max.floor("s"), "s")
+
+
+def _date_format(values):
+    # One format for the whole column, guessed from the first non-empty value
+    for value in values:
+        if isinstance(value, str) and value.strip():
+            return guess_datetime_format(value.strip()) or "mixed"
+    return "mixed"
+
+
+def _to_datetime(values, date_format):
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values
+    if date_format is None:
+        date_format = _date_format(values)
+    if date_format in ISO_FORMATS:
+        try:
+            parsed = values.astype("datetime64[s]")
+        except (ValueError, TypeError):
+            pass  # Junk somewhere in the column; let pandas coerce it
+        else:
+            parsed[(parsed < _NS_MIN) | (parsed > _NS_MAX)] = np.datetime64("NaT")
+            return parsed.astype("datetime64[ns]")
+    return pd.to_datetime(values, format=date_format, errors='coerce').to_numpy()
+
+
+def _to_float(values):
+    if values.dtype == np.float64:
+        return values
+    try:
+        # numpy parses numeric strings in C; fall back for blanks and junk
+        return values.astype(np.float64)
+    except (ValueError, TypeError):
+        return pd.to_numeric(values, errors='coerce').astype(np.float64)
+
+
+def _row_grid(data, width):
+    """Rows as a 2-D object array of ``width`` columns, and whether any were short."""
+    try:
+        # Rectangular rows are transposed by numpy in C without any padding
+        grid = np.array(data, dtype=object)
+        if grid.ndim == 2 and grid.shape[1] >= width:
+            return grid[:, :width], False
+    except ValueError:
+        pass  # Ragged rows
+    grid = pd.DataFrame(data).to_numpy(dtype=object)
+    if grid.shape[1] < width:
+        grid = np.hstack([grid, np.full((len(grid), width - grid.shape[1]), None, dtype=object)])
+    return grid[:, :width], True
+
+
+@profiling.timed("sheet_frame.build_price_frame")
+def build_price_frame(data, columns=None, date_format=None):
+    """Build a typed, cleaned and date-sorted price table in a single pass.
+
+    ``data`` is either a list of row lists (with ``columns`` naming them) or
+    an existing DataFrame. ``Date`` becomes datetime64 using ``date_format``
+    (guessed once from the first value when omitted) and ``Close`` float64;
+    unparseable values become missing. Rows with any missing value are then
+    dropped with one combined mask and the rest ordered by date with a
+    single gather, keeping the original row positions as the index.
+    Without a Date or Close column the table is returned untouched.
+    """
+    frame = None
+    if isinstance(data, pd.DataFrame):
+        frame = data
+        columns = list(data.columns)
+        text_columns = [name for name in columns if name not in (DATE_COLUMN, CLOSE_COLUMN)]
+        # Other columns keep the dtypes the CSV reader gave them
+        grid = data[text_columns]
+        dates = data[DATE_COLUMN].to_numpy() if DATE_COLUMN in data else None
+        closes = data[CLOSE_COLUMN].to_numpy() if CLOSE_COLUMN in data else None
+        check_text = True
+    else:
+        columns = list(columns)
+        grid, check_text = _row_grid(data, len(columns))
+        if DATE_COLUMN not in columns and CLOSE_COLUMN not in columns:
+            return pd.DataFrame(grid, columns=columns)
+        text_columns = [name for name in columns if name not in (DATE_COLUMN, CLOSE_COLUMN)]
+        dates = grid[:, columns.index(DATE_COLUMN)] if DATE_COLUMN in columns else None
+        closes = grid[:, columns.index(CLOSE_COLUMN)] if CLOSE_COLUMN in columns else None
+        grid = grid[:, [columns.index(name) for name in text_columns]]
+
+    if dates is None and closes is None:
+        return frame if frame is not None else pd.DataFrame(grid, columns=columns)
+
+    keep = np.ones(len(grid), dtype=bool)
+    if dates is not None:
+        dates = _to_datetime(dates, date_format)
+        keep &= ~np.isnat(dates)
+    if closes is not None:
+        closes = _to_float(closes)
+        keep &= ~np.isnan(closes)
+    # Scraped cells are always strings; only padded or CSV blanks can be missing
+    if check_text and grid.size:
+        keep &= ~np.asarray(pd.isna(grid)).any(axis=1)
+
+    order = np.flatnonzero(keep)
+    if dates is not None:
+        order = order[np.argsort(dates[order], kind="stable")]
+
+    # One gather for the text columns, then the typed ones slotted in place
+    if frame is not None:
+        frame = grid.take(order)
+    else:
+        frame = pd.DataFrame(grid[order], index=order, columns=text_columns)
+    typed = [(columns.index(name), name, values)
+             for name, values in ((DATE_COLUMN, dates), (CLOSE_COLUMN, closes)) if values is not None]
+    for position, name, values in sorted(typed):
+        frame.insert(position, name, values[order])
+    return frame
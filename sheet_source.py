@@ -0,0 +1,149 @@
+import csv
+import io
+import re
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import pandas as pd
+import requests
+
+import profiling
+import sheet_fetch
+import sheet_frame
+import table_extract
+
+# Columns A to F of the sheet
+MAX_COLUMNS = 6
+
+# Explicit dtypes for the columns the chart needs; other columns stay text
+COLUMN_DTYPES = {sheet_frame.CLOSE_COLUMN: "float64"}
+
+_SHEET_PATH = re.compile(r"^/spreadsheets/d/(?P<published>e/)?(?P<id>[\w-]+)")
+
+
+class SheetTable:
+    """A parsed sheet: the stock name from cell A1 and the rows below the header row.
+
+    ``frame`` is typed, cleaned and sorted by ``sheet_frame.build_price_frame``
+    and is shared through the fetch cache, so callers must not modify it.
+    """
+
+    def __init__(self, stock_name, frame, source, default_headers=False):
+        self.stock_name = stock_name
+        self.frame = frame
+        # "csv" or "html", whichever path produced the table
+        self.source = source
+        # True when row 2 had missing or duplicate headers and Column 1..6 were used
+        self.default_headers = default_headers
+
+
+def csv_export_url(url):
+    """Rewrite a Google Sheets URL to its CSV export form, or ``None`` if it isn't one.
+
+    Editor links (``/d/<id>/edit#gid=N``) map to ``/export?format=csv&gid=N``
+    and published links (``/d/e/<id>/pubhtml``) to ``/pub?output=csv``.
+    """
+    parsed = urlparse(url)
+    if parsed.netloc != "docs.google.com":
+        return None
+    match = _SHEET_PATH.match(parsed.path)
+    if not match:
+        return None
+    query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+    # Editor links carry the tab in the fragment (#gid=N)
+    fragment = parse_qs(parsed.fragment)
+    if "gid" in fragment and "gid" not in query:
+        query["gid"] = fragment["gid"][0]
+
+    base = f"https://docs.google.com/spreadsheets/d/{'e/' if match['published'] else ''}{match['id']}"
+    if match["published"]:
+        params = {"output": "csv"}
+        params.update((key, query[key]) for key in ("gid", "single") if key in query)
+        return f"{base}/pub?{urlencode(params)}"
+    params = {"format": "csv"}
+    if "gid" in query:
+        params["gid"] = query["gid"]
+    return f"{base}/export?{urlencode(params)}"
+
+
+def _check_headers(headers, max_columns):
+    # Missing or duplicate headers fall back to Column 1..N for the row's width
+    if not headers or len(set(headers)) != len(headers):
+        return [f"Column {i+1}" for i in range(len(headers) or max_columns)], True
+    return headers, False
+
+
+@profiling.timed("sheet_source.parse_csv")
+def parse_csv(text, max_columns=MAX_COLUMNS):
+    """Parse CSV export text: A1 is the stock name, row 2 the headers, then data.
+
+    The body is streamed through pandas' C reader straight into typed
+    columns; ``Close`` is read as float64 and ``Date`` as datetime64.
+    """
+    if text.lstrip()[:1] == "<":
+        # Sheets answers with an HTML page when export is not allowed
+        raise ValueError("Response is HTML, not CSV.")
+    buffer = io.StringIO(text)
+    reader = csv.reader(buffer)
+    name_row = next(reader, [])
+    header_row = next(reader, [])
+    stock_name = name_row[0].strip() if name_row and name_row[0].strip() else "Unknown Stock"
+    headers, default_headers = _check_headers([cell.strip() for cell in header_row[:max_columns]],
+                                              max_columns)
+    columns = list(range(len(headers)))
+
+    # Blank cells stay "" like scraped ones; only a blank Close is missing,
+    # so a row isn't dropped for an empty cell in some other column
+    text_dtypes = {name: str for name in headers if name not in COLUMN_DTYPES}
+    na_values = {name: [""] for name in COLUMN_DTYPES if name in headers}
+
+    def read(dtypes):
+        # The reader above stopped right after the header row
+        buffer.seek(position)
+        return pd.read_csv(buffer, header=None, names=headers, usecols=columns, dtype=dtypes,
+                           keep_default_na=False, na_values=na_values, skip_blank_lines=True)
+
+    position = buffer.tell()
+    dtypes = {name: dtype for name, dtype in COLUMN_DTYPES.items() if name in headers}
+    try:
+        frame = read({**text_dtypes, **dtypes})
+    except (ValueError, TypeError):
+        # A non-numeric value somewhere in Close; build_price_frame coerces it
+        frame = read(text_dtypes)
+    return SheetTable(stock_name, sheet_frame.build_price_frame(frame), "csv", default_headers)
+
+
+@profiling.timed("sheet_source.parse_html")
+def parse_html(html, max_columns=MAX_COLUMNS):
+    """Parse a published sheet page; raises ``LookupError`` if it has no table.
+
+    Row 0 of the rendered table holds the column letters, row 1 the stock
+    name and row 2 the headers, so data starts at row 3.
+    """
+    rows = table_extract.extract_rows(html, max_columns)
+    if rows is None:
+        raise LookupError("No table found on the page.")
+
+    stock_name = "Unknown Stock"
+    if len(rows) > 1 and rows[1] and rows[1][0]:
+        stock_name = rows[1][0]
+    headers, default_headers = _check_headers(rows[2] if len(rows) > 2 else [], max_columns)
+    data = [cells for cells in rows[3:] if cells]
+    frame = sheet_frame.build_price_frame(data, headers)
+    return SheetTable(stock_name, frame, "html", default_headers)
+
+
+def load_sheet(url, fetcher=None, submit=None):
+    """Load a sheet via its CSV export, falling back to scraping the HTML page.
+
+    Results are cached by the fetcher, so an unchanged sheet is neither
+    downloaded nor parsed again. ``submit`` is passed on to
+    ``SheetFetcher.get_parsed`` to choose where parsing runs.
+    """
+    fetcher = fetcher or sheet_fetch.get_fetcher()
+    csv_url = csv_export_url(url)
+    if csv_url is not None:
+        try:
+            return fetcher.get_parsed(csv_url, parse_csv, submit)
+        except (requests.RequestException, ValueError, csv.Error):
+            pass  # Export disabled or not CSV; scrape the page instead
+    return fetcher.get_parsed(url, parse_html, submit)
@@ -0,0 +1,179 @@
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional; the stdlib engine is used without it
+    etree = None
+
+import profiling
+
+# Columns A to F of the published sheet
+MAX_COLUMNS = 6
+
+# Input is fed to the incremental parsers in chunks of this many characters
+CHUNK_SIZE = 64 * 1024
+
+
+class _TableParser(HTMLParser):
+    """Incremental parser that collects the ``<td>`` text of the first table.
+
+    Completed rows accumulate in ``rows`` and can be drained between
+    ``feed`` calls. Text is only buffered for the first ``max_columns`` cells
+    of a row, and everything after the first ``</table>`` is ignored.
+    """
+
+    def __init__(self, max_columns):
+        super().__init__(convert_charrefs=True)
+        self.max_columns = max_columns
+        self.rows = []
+        self.found = False
+        self.done = False
+        self._depth = 0     # nesting depth inside the first table
+        self._row = None    # cells of the open <tr>
+        self._cell = None   # text pieces of the open <td>
+
+    def _close_cell(self):
+        if self._cell is not None:
+            self._row.append("".join(self._cell).strip())
+            self._cell = None
+
+    def _close_row(self):
+        self._close_cell()
+        if self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "table":
+            self.found = True
+            self._depth += 1
+        elif not self._depth:
+            return
+        elif tag == "tr":
+            self._close_row()
+            self._row = []
+        elif tag == "td" and self._row is not None:
+            self._close_cell()
+            if len(self._row) < self.max_columns:
+                self._cell = []
+
+    def handle_endtag(self, tag):
+        if self.done or not self._depth:
+            return
+        if tag == "td":
+            self._close_cell()
+        elif tag == "tr":
+            self._close_row()
+        elif tag == "table":
+            self._depth -= 1
+            if not self._depth:
+                self._close_row()
+                self.done = True
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def _iter_stdlib(html, max_columns):
+    parser = _TableParser(max_columns)
+    for start in range(0, len(html), CHUNK_SIZE):
+        parser.feed(html[start:start + CHUNK_SIZE])
+        yield from parser.rows
+        parser.rows.clear()
+        if parser.done:
+            return
+    parser.close()
+    parser._close_row()
+    yield from parser.rows
+    if not parser.found:
+        raise LookupError("No table found")
+
+
+def _lxml_events(html):
+    parser = etree.HTMLPullParser(events=("start", "end"), tag=("table", "tr"))
+    for start in range(0, len(html), CHUNK_SIZE):
+        parser.feed(html[start:start + CHUNK_SIZE])
+        yield from parser.read_events()
+    # Closing flushes end events for elements left open at end of input
+    parser.close()
+    yield from parser.read_events()
+
+
+def _lxml_cell_text(cell):
+    # Plain cells have a single text node; only nested markup needs itertext
+    if len(cell):
+        return "".join(cell.itertext()).strip()
+    return (cell.text or "").strip()
+
+
+def _iter_lxml(html, max_columns):
+    depth = 0
+    found = False
+    for event, element in _lxml_events(html):
+        if element.tag == "table":
+            if event == "start":
+                found = True
+                depth += 1
+            else:
+                depth -= 1
+                if not depth:
+                    return
+        elif depth and event == "end":
+            row = []
+            for cell in element.iterchildren("td"):
+                if len(row) == max_columns:
+                    break
+                row.append(_lxml_cell_text(cell))
+            yield row
+            # Drop finished rows so memory stays flat on huge tables
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    if not found:
+        raise LookupError("No table found")
+
+
+def _iter_bs4(html, max_columns):
+    # The original scraping path, limited to the table subtree
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("table"))
+    table = soup.find("table")
+    if table is None:
+        raise LookupError("No table found")
+    for row in table.find_all("tr"):
+        yield [cell.text.strip() for cell in row.find_all("td")[:max_columns]]
+
+
+ENGINES = {
+    "html.parser": _iter_stdlib,
+    "bs4": _iter_bs4,
+}
+if etree is not None:
+    ENGINES["lxml"] = _iter_lxml
+
+DEFAULT_ENGINE = "lxml" if etree is not None else "html.parser"
+
+
+def iter_rows(html, engine=None, max_columns=MAX_COLUMNS):
+    """Stream the first ``<table>`` as rows of stripped ``<td>`` strings.
+
+    Rows are yielded as soon as they are parsed, with at most ``max_columns``
+    cells each (rows without ``<td>`` cells come through empty). Raises
+    ``LookupError`` when the page has no table. ``engine`` is one of
+    ``ENGINES``; lxml is used when it is installed. On well-formed tables
+    every engine returns the same rows as the original BeautifulSoup path.
+    """
+    return ENGINES[engine or DEFAULT_ENGINE](html, max_columns)
+
+
+@profiling.timed("table_extract.extract_rows")
+def extract_rows(html, max_columns=MAX_COLUMNS):
+    """Return the first ``<table>`` as a list of rows, or ``None`` without a table."""
+    try:
+        return list(iter_rows(html, max_columns=max_columns))
+    except LookupError:
+        return None
@@ -0,0 +1,32 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [APP_DIR, os.path.join(APP_DIR, "benchmarks")]
+
+# The stores read their paths on import, so point them at scratch files first
+_tmp = tempfile.TemporaryDirectory()
+os.environ["USERS_DB_PATH"] = os.path.join(_tmp.name, "users.db")
+os.environ["PRICES_DB_PATH"] = os.path.join(_tmp.name, "prices.db")
+
+from sheet_server import SheetServer  # noqa: E402
+
+
+@pytest.fixture
+def sheet_server():
+    """A local stand-in for published sheets that counts the requests it gets."""
+    with SheetServer() as server:
+        yield server
+
+
+@pytest.fixture
+def app():
+    """``app(script)`` returns an AppTest for one of the pages."""
+    from streamlit.testing.v1 import AppTest
+
+    def load(script):
+        return AppTest.from_file(os.path.join(APP_DIR, script), default_timeout=30)
+    return load
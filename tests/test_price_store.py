@@ -0,0 +1,37 @@
+import price_store
+import refresh_scheduler
+from sheet_server import SheetServer
+
+
+def widget(elements, label):
+    return next(element for element in elements if element.label == label)
+
+
+def test_page_loads_read_the_store_without_requests(app, sheet_server):
+    url = sheet_server.url("STORE", 100)
+    at = app("webscraper.py").run()
+    widget(at.text_input, "Enter Google Sheet URL").input(url)
+    widget(at.button, "Fetch Data").click()
+    at.run()
+    assert not at.exception
+    fetched = sheet_server.requests
+    assert fetched > 0
+
+    for _ in range(3):
+        at.run()
+    assert not at.exception
+    assert sheet_server.requests == fetched
+    assert at.get("plotly_chart")
+    assert len(price_store.load_prices(url)) == 100
+
+
+def test_refresh_appends_only_new_rows(tmp_path):
+    path = str(tmp_path / "prices.db")
+    with SheetServer() as server:
+        scheduler = refresh_scheduler.RefreshScheduler(store_path=path)
+        url = server.url("GROW", 10)
+        assert scheduler.refresh(url, raise_errors=True) == 10
+        server.growth = 5
+        assert scheduler.refresh(url, raise_errors=True) == 5
+        assert scheduler.refresh(url, raise_errors=True) == 0
+        assert len(price_store.load_prices(url, path)) == 15
@@ -0,0 +1,33 @@
+import profiling
+import rate_limit
+
+
+def widget(elements, label):
+    return next(element for element in elements if element.label == label)
+
+
+def test_throttled_logins_are_rejected_before_verify_user(app):
+    at = app("auth.py").run()
+    attempts = rate_limit.USER_BURST + 3
+    verified = []
+    for _ in range(attempts):
+        widget(at.text_input, "Username").input("mallory")
+        widget(at.text_input, "Password").input("not-the-password")
+        at.button(key="login").click()
+        with profiling.collect() as spans:
+            at.run()
+        verified.append(spans.get("auth.verify_user", {"count": 0})["count"])
+    assert verified == [1] * rate_limit.USER_BURST + [0] * 3
+    assert "Too many login attempts" in at.error[-1].value
+
+
+def test_burst_of_attempts_admits_only_the_bucket():
+    now = [1000.0]
+    throttle = rate_limit.LoginThrottle(user_burst=5, session_burst=10_000, global_burst=10_000, persist=False,
+                                        clock=lambda: now[0])
+    admitted = 0
+    # 10,000 attempts within one second against a single username
+    for i in range(10_000):
+        now[0] += 1e-4
+        admitted += not throttle.check("alice", f"session-{i}")
+    assert admitted == 5
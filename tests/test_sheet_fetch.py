@@ -0,0 +1,26 @@
+import sheet_fetch
+
+
+def test_not_modified_skips_parsing(sheet_server):
+    fetcher = sheet_fetch.SheetFetcher(ttl=0)
+    parses = []
+
+    def parse(text):
+        parses.append(text)
+        return len(text)
+
+    url = sheet_server.url("TEST", 50)
+    first = fetcher.get_parsed(url, parse)
+    assert fetcher.get_parsed(url, parse) == first
+    assert (sheet_server.requests, sheet_server.not_modified, len(parses)) == (2, 1, 1)
+
+    sheet_server.version = "2"
+    fetcher.get_parsed(url, parse)
+    assert (sheet_server.requests, sheet_server.not_modified, len(parses)) == (3, 1, 2)
+
+
+def test_fresh_cache_makes_no_request(sheet_server):
+    fetcher = sheet_fetch.SheetFetcher(ttl=60)
+    url = sheet_server.url("TEST", 50)
+    assert fetcher.get(url) is fetcher.get(url)
+    assert sheet_server.requests == 1
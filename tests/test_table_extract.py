@@ -0,0 +1,32 @@
+import pytest
+from bs4 import BeautifulSoup
+
+import table_extract
+from sheet_server import sheet_html, table_html
+
+
+def original_rows(html):
+    # The scraper's path before table_extract: a full html.parser tree
+    table = BeautifulSoup(html, "html.parser").find("table")
+    return [[cell.text.strip() for cell in row.find_all("td")[:6]] for row in table.find_all("tr")]
+
+
+PAGES = {
+    "sheet": sheet_html("TEST", 200),
+    "extra columns": sheet_html("TEST", 50, extra_columns=4),
+    "entities and blanks": table_html([["A &amp; B", "", " 1 ", "&lt;2&gt;", "x<b>y</b>", "é"]] * 3),
+    "second table ignored": table_html([["first"] * 6]) + table_html([["second"] * 6]),
+}
+
+
+@pytest.mark.parametrize("engine", sorted(table_extract.ENGINES))
+@pytest.mark.parametrize("page", sorted(PAGES))
+def test_engines_match_the_beautifulsoup_path(engine, page):
+    html = PAGES[page]
+    assert list(table_extract.iter_rows(html, engine)) == original_rows(html)
+
+
+@pytest.mark.parametrize("engine", sorted(table_extract.ENGINES))
+def test_page_without_table(engine):
+    with pytest.raises(LookupError):
+        list(table_extract.iter_rows("<html><body><p>No sheet here</p></body></html>", engine))
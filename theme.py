@@ -0,0 +1,96 @@
+import json
+import os
+import re
+import threading
+import time
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11; TOML palettes then need the tomli backport
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+import assets
+import profiling
+
+# Base stylesheet and the palette definitions, resolved like other assets.
+# Palettes can be JSON or TOML (a table per palette); edits to either file
+# are picked up by the first rerun after the next check.
+STYLESHEET = "styles.css"
+PALETTES_PATH = os.environ.get("COLOR_PALETTES_PATH", "palettes.json")
+
+# Files are checked for changes at most this often (seconds); reruns in
+# between are served straight from memory
+CHECK_INTERVAL = float(os.environ.get("THEME_CHECK_INTERVAL", "1.0"))
+
+_COMMENTS = re.compile(r"/\*.*?\*/", re.S)
+_WHITESPACE = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r" ?([{};,>]) ?")
+
+# palettes path -> (monotonic time of the last check, (stylesheet digest,
+# palettes digest), (palettes, {name: rendered <style> block}))
+_current = {}
+_lock = threading.Lock()
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from ``css``.
+
+    Only whitespace around ``{ } ; , >`` and after ``:`` is removed, which
+    leaves descendant selectors such as ``div :hover`` intact. Quoted
+    strings are not treated specially, so they must not contain ``/*``.
+    """
+    css = _WHITESPACE.sub(" ", _COMMENTS.sub("", css))
+    css = _PUNCTUATION.sub(r"\1", css).replace(": ", ":")
+    return css.replace(";}", "}").strip()
+
+
+def variable_block(palette):
+    """The ``:root`` block turning palette keys (``top_bar_color``) into CSS variables (``--top-bar-color``)."""
+    variables = ";".join(f"--{key.replace('_', '-')}:{value}" for key, value in palette.items())
+    return f":root{{{variables}}}"
+
+
+def load_palettes(path=None):
+    """Parse the palette file into ``{name: {key: color}}``, keeping the file's order."""
+    path = path or PALETTES_PATH
+    text = assets.read_text(path)
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise RuntimeError(f"Reading {path} needs Python 3.11+ or the tomli package.")
+        return tomllib.loads(text)
+    return json.loads(text)
+
+
+def _render(path):
+    path = path or PALETTES_PATH
+    current = _current.get(path)
+    if current is not None and time.monotonic() - current[0] < CHECK_INTERVAL:
+        return current[2]
+
+    key = (assets.content_hash(STYLESHEET), assets.content_hash(path))
+    if current is not None and current[1] == key:
+        rendered = current[2]
+    else:
+        # Every palette is rendered at once; a change to either file
+        # replaces the whole set
+        base = minify_css(assets.read_text(STYLESHEET))
+        palettes = load_palettes(path)
+        sheets = {name: f"<style>{base}{variable_block(palette)}</style>" for name, palette in palettes.items()}
+        rendered = (palettes, sheets)
+    with _lock:
+        _current[path] = (time.monotonic(), key, rendered)
+    return rendered
+
+
+def palettes(path=None):
+    """The current palettes, reloaded only when the file changes."""
+    return _render(path)[0]
+
+
+@profiling.timed("theme.stylesheet")
+def stylesheet(name, path=None):
+    """The minified ``<style>`` block of styles.css with palette ``name`` applied."""
+    return _render(path)[1][name]
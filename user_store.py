@@ -0,0 +1,365 @@
+import hashlib
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import profiling
+
+# Location of the user database and the number of pooled connections.
+# Both can be overridden through the environment.
+DB_PATH = os.environ.get("USERS_DB_PATH", "users.db")
+POOL_SIZE = int(os.environ.get("USERS_DB_POOL_SIZE", "4"))
+
+# How long a caller waits for a free connection before giving up (seconds)
+POOL_TIMEOUT = 10.0
+
+# SQL statements are kept as module constants so that each pooled connection's
+# statement cache hands back the already prepared statement on every call.
+SELECT_USERNAME_SQL = "SELECT username FROM users WHERE username = ?"
+SELECT_CREDENTIALS_SQL = "SELECT password, role FROM users WHERE username = ?"
+INSERT_USER_SQL = "INSERT INTO users (username, password, role) VALUES (?, ?, ?)"
+UPDATE_PASSWORD_SQL = "UPDATE users SET password = ? WHERE username = ?"
+UPSERT_LOCKOUT_SQL = ("INSERT INTO login_lockouts (username, locked_until) VALUES (?, ?) "
+                      "ON CONFLICT (username) DO UPDATE SET locked_until = excluded.locked_until")
+SELECT_LOCKOUTS_SQL = "SELECT username, locked_until FROM login_lockouts WHERE locked_until > ?"
+PURGE_LOCKOUTS_SQL = "DELETE FROM login_lockouts WHERE locked_until <= ?"
+UPDATE_ROLE_SQL = "UPDATE users SET role = ? WHERE username = ?"
+SELECT_ROLE_SQL = "SELECT role FROM users WHERE username = ?"
+
+
+class ConnectionPool:
+    """A small thread-safe pool of long-lived SQLite connections.
+
+    Connections are opened lazily up to ``size`` and reused across Streamlit
+    script reruns, so a login costs one prepared query instead of a
+    connect/close round trip.
+    """
+
+    def __init__(self, path=DB_PATH, size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout,
+                               check_same_thread=False, cached_statements=128)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection pool is closed.")
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+
+        if can_open:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Timed out waiting for a database connection.")
+
+    def _release(self, conn):
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; commits on success and rolls back on error."""
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._release(conn)
+
+    def close(self):
+        """Close every idle connection and stop handing out new ones."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+# One pool per database file, shared by every rerun in the process
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path=None, size=None):
+    """Return the process-wide pool for ``path``, creating it on first use."""
+    key = os.path.abspath(path or DB_PATH)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(key, size or POOL_SIZE)
+            _pools[key] = pool
+        return pool
+
+
+def close_all_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+# Function to check if a column exists in a table
+def column_exists(cursor, table_name, column_name):
+    cursor.execute(f"PRAGMA table_info({table_name})")
+    return any(column[1] == column_name for column in cursor.fetchall())
+
+
+# Schema migrations. Each entry is (version, function taking a cursor) and
+# runs exactly once per database, in order. Migrations are frozen snapshots:
+# never edit one that has shipped, append a new version instead.
+def _create_users_table(cursor):
+    cursor.execute('''CREATE TABLE IF NOT EXISTS users (
+                    username TEXT PRIMARY KEY,
+                    password TEXT NOT NULL,
+                    role TEXT DEFAULT 'user')''')
+    # Databases created before roles existed lack the column
+    if not column_exists(cursor, 'users', 'role'):
+        cursor.execute("ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'user'")
+
+
+def _seed_admin(cursor):
+    admin_password = hashlib.sha256("admin123".encode()).hexdigest()
+    cursor.execute("INSERT OR IGNORE INTO users (username, password, role) VALUES (?, ?, ?)",
+                   ("admin", admin_password, "admin"))
+    cursor.execute("UPDATE users SET role = ? WHERE username = ?", ("admin", "admin"))
+
+
+def _index_users_by_role(cursor):
+    # username is the primary key and already indexed; role-sorted and
+    # role-filtered pages walk this index instead of scanning the table
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_role_username ON users (role, username)")
+
+
+def _create_login_lockouts(cursor):
+    # Usernames locked out after repeated failed logins, kept across restarts;
+    # locked_until is in seconds since the epoch
+    cursor.execute('''CREATE TABLE IF NOT EXISTS login_lockouts (
+                    username TEXT PRIMARY KEY,
+                    locked_until REAL NOT NULL)''')
+
+
+MIGRATIONS = [
+    (1, _create_users_table),
+    (2, _seed_admin),
+    (3, _index_users_by_role),
+    (4, _create_login_lockouts),
+]
+
+
+def schema_version(cursor):
+    cursor.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+    row = cursor.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def migrate(path=None, migrations=None):
+    """Apply every pending migration and return the resulting schema version.
+
+    ``migrations`` defaults to the user database's ``MIGRATIONS``; other
+    SQLite stores pass their own list.
+    """
+    with get_pool(path).connection() as conn:
+        # Take the write lock up front so concurrent processes migrate one at a time
+        conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.cursor()
+        current = schema_version(cursor)
+        for version, apply in migrations or MIGRATIONS:
+            if version > current:
+                apply(cursor)
+                cursor.execute("INSERT INTO schema_version (version) VALUES (?)", (version,))
+                current = version
+        return current
+
+
+# Database files already migrated by this process, keyed by path and mapped to
+# the file's identity so a replaced or deleted database is migrated again.
+_migrated = {}
+_migrate_lock = threading.Lock()
+
+
+def _file_identity(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_dev, stat.st_ino)
+
+
+def ensure_schema(path=None, migrations=None):
+    """Run migrations once per process (or when the database file changes).
+
+    Subsequent calls only stat the file and do no database I/O.
+    """
+    key = os.path.abspath(path or DB_PATH)
+    identity = _file_identity(key)
+    if identity is not None and _migrated.get(key) == identity:
+        return
+    with _migrate_lock:
+        if identity is not None and _migrated.get(key) == identity:
+            return
+        if key in _migrated:
+            # The file was replaced or deleted under an open pool, so the
+            # pooled connections point at the old file; start fresh ones.
+            with _pools_lock:
+                pool = _pools.pop(key, None)
+            if pool is not None:
+                pool.close()
+        migrate(key, migrations)
+        _migrated[key] = _file_identity(key)
+
+
+def user_exists(username, path=None):
+    with get_pool(path).connection() as conn:
+        return conn.execute(SELECT_USERNAME_SQL, (username,)).fetchone() is not None
+
+
+@profiling.timed("user_store.get_credentials")
+def get_credentials(username, path=None):
+    """Return ``(password_hash, role)`` for ``username`` or ``None``."""
+    with get_pool(path).connection() as conn:
+        return conn.execute(SELECT_CREDENTIALS_SQL, (username,)).fetchone()
+
+
+def add_user(username, password_hash, role='user', path=None):
+    with get_pool(path).connection() as conn:
+        conn.execute(INSERT_USER_SQL, (username, password_hash, role))
+
+
+def update_password(username, password_hash, path=None):
+    with get_pool(path).connection() as conn:
+        conn.execute(UPDATE_PASSWORD_SQL, (password_hash, username))
+
+
+def get_role(username, path=None):
+    """Return the role of ``username``, or ``None`` if there is no such user."""
+    with get_pool(path).connection() as conn:
+        row = conn.execute(SELECT_ROLE_SQL, (username,)).fetchone()
+    return row[0] if row else None
+
+
+def update_role(username, role, path=None):
+    with get_pool(path).connection() as conn:
+        conn.execute(UPDATE_ROLE_SQL, (role, username))
+
+
+def save_lockout(username, locked_until, path=None):
+    with get_pool(path).connection() as conn:
+        conn.execute(UPSERT_LOCKOUT_SQL, (username, locked_until))
+
+
+def active_lockouts(now, path=None):
+    """``{username: locked_until}`` for lockouts still in force at ``now``; expired ones are purged."""
+    with get_pool(path).connection() as conn:
+        conn.execute(PURGE_LOCKOUTS_SQL, (now,))
+        return dict(conn.execute(SELECT_LOCKOUTS_SQL, (now,)).fetchall())
+
+
+# Columns the admin listing can be sorted by; every sort ends on username so
+# the (sort key, username) pair of the last row is a unique keyset cursor.
+SORT_KEYS = {
+    "username": ("username",),
+    "role": ("role", "username"),
+}
+
+
+def _prefix_upper_bound(prefix):
+    # Smallest string greater than every string starting with prefix
+    while prefix and ord(prefix[-1]) == 0x10FFFF:
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def fetch_users_page(after=None, limit=50, search="", role=None, sort="username",
+                     descending=False, path=None):
+    """Return up to ``limit`` ``(username, role)`` rows following ``after``.
+
+    ``after`` is the cursor of the last row of the previous page (see
+    ``page_cursor``); ``None`` starts from the beginning. ``search`` matches a
+    username prefix and ``role`` filters exactly, both through indexes, so each
+    page costs the same regardless of table size. Password hashes are never
+    returned.
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unsupported sort column: {sort}")
+    keys = SORT_KEYS[sort]
+    conditions = []
+    params = []
+
+    if search:
+        conditions.append("username >= ?")
+        params.append(search)
+        upper = _prefix_upper_bound(search)
+        if upper is not None:
+            conditions.append("username < ?")
+            params.append(upper)
+    if role:
+        conditions.append("role = ?")
+        params.append(role)
+    if after is not None:
+        columns = ", ".join(keys)
+        placeholders = ", ".join("?" * len(keys))
+        conditions.append(f"({columns}) {'<' if descending else '>'} ({placeholders})")
+        params.extend(after)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    direction = "DESC" if descending else "ASC"
+    order = ", ".join(f"{key} {direction}" for key in keys)
+    params.append(limit)
+    with get_pool(path).connection() as conn:
+        return conn.execute(f"SELECT username, role FROM users {where} ORDER BY {order} LIMIT ?",
+                            params).fetchall()
+
+
+def page_cursor(row, sort="username"):
+    """Keyset cursor to pass as ``after`` to fetch the page following ``row``."""
+    values = {"username": row[0], "role": row[1]}
+    return tuple(values[key] for key in SORT_KEYS[sort])
+
+
+def iter_user_pages(batch_size=1000, **filters):
+    """Yield successive pages until the listing is exhausted."""
+    after = None
+    while True:
+        page = fetch_users_page(after=after, limit=batch_size, **filters)
+        if not page:
+            return
+        yield page
+        after = page_cursor(page[-1], filters.get("sort", "username"))
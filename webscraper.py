@@ -1,8 +1,10 @@
 import streamlit as st
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import plotly.express as px
+import downsample
+import price_store
+import refresh_scheduler
+import sheet_batch
+import sheet_source
 
 # Streamlit App Title
 st.title("Google Sheets Web Scraper & Stock Chart")
@@ -13,77 +15,97 @@ st.write("Enter the URL of your publicly accessible Google Sheet to fetch column
 # Input for Google Sheet URL
 sheet_url = st.text_input("Enter Google Sheet URL", "")
 
+# Long histories are downsampled to this many points before charting
+chart_points = st.number_input("Maximum chart points", min_value=100, max_value=50_000,
+                               value=downsample.POINT_BUDGET, step=100)
+
+# Tracked sheets are kept fresh by a background worker shared by every session
+scheduler = refresh_scheduler.get_scheduler()
+
+# Sheets fetched in this browser session; other visitors' sheets aren't listed
+my_sheets = st.session_state.setdefault('tracked_urls', [])
+
 # Button to fetch data
 if st.button("Fetch Data"):
     if not sheet_url:
         st.error("Please enter a valid Google Sheet URL.")
     else:
+        # Load the sheet once now (CSV export first, HTML scraping as
+        # fallback). Price tables are tracked and the scheduler refreshes
+        # them from then on; other tables are only shown.
         try:
-            # Send a GET request to the URL
-            response = requests.get(sheet_url)
-
-            # Check if the request was successful
-            if response.status_code != 200:
-                st.error("Failed to fetch the Google Sheet. Please check the URL and try again.")
+            sheet = sheet_source.load_sheet(sheet_url, scheduler.fetcher)
+            if price_store.can_store(sheet.frame):
+                scheduler.add(sheet_url, sheet)
+                if sheet_url not in my_sheets:
+                    my_sheets.append(sheet_url)
+                st.session_state['sheet_url'] = sheet_url
+            elif sheet.frame.empty:
+                st.warning("No data found in the table.")
             else:
-                # Parse the HTML content
-                soup = BeautifulSoup(response.text, "html.parser")
-
-                # Extract table data
-                table = soup.find("table")
-                if table:
-                    rows = table.find_all("tr")  # Get all rows
-                    data = []
-
-                    # Extract stock name from Cell A1 (first cell of the first row)
-                    stock_name = "Unknown Stock"
-                    if rows:
-                        stock_name_row = rows[1]  # Row 1 is the first row (index 0)
-                        stock_name_cell = stock_name_row.find("td")  # Get the first cell in Row 1 (Cell A1)
-                        if stock_name_cell:
-                            stock_name = stock_name_cell.text.strip()
-                    st.write(f"Stock Name: {stock_name}")
+                st.write(f"Stock Name: {sheet.stock_name}")
+                st.table(sheet.frame.tail(5))
+                st.info("Only sheets with Date and Close columns are charted and kept up to date.")
+        except LookupError:
+            st.warning("No table found on the page. Google Sheets may not be scrapable due to dynamic content loading.")
+        except requests.RequestException:
+            st.error("Failed to fetch the Google Sheet. Please check the URL and try again.")
+        except Exception as e:
+            st.error(f"An error occurred: {e}")
 
-                    # Extract headers from the second row (Row 2)
-                    if len(rows) > 1:
-                        header_row = rows[2]  # Row 2 is the second row (index 1)
-                        headers = [header.text.strip() for header in header_row.find_all("td")[:6]]
+# Everything below reads the local store only; no network I/O on page loads
+tracked = {url: symbol for url, symbol, *_ in price_store.tracked_sheets() if symbol and url in my_sheets}
+if tracked:
+    urls = list(tracked)
+    selected = st.session_state.get('sheet_url')
+    selected_url = st.selectbox("Tracked sheets", urls, format_func=lambda url: f"{tracked[url]} ({url})",
+                                index=urls.index(selected) if selected in tracked else 0)
+    # Sheets no one looks at are untracked after a while
+    price_store.viewed(selected_url)
 
-                        if not headers or len(set(headers)) != len(headers):
-                            headers = [f"Column {i+1}" for i in range(6)]
-                            st.warning("Invalid headers found. Using default column names.")
+    stock_name, columns = price_store.sheet_columns(selected_url)
+    st.write(f"Stock Name: {stock_name}")
+    lag = scheduler.refresh_lag().get(selected_url)
+    if lag is not None:
+        st.caption(f"Last refreshed {lag:.0f} s ago; refreshed every {scheduler.interval:.0f} s.")
 
-                        # Start processing from Row 3 (index 2) to skip the stock name and header rows
-                        for row in rows[2:]:
-                            cells = row.find_all("td")[:6]
-                            if cells:
-                                data.append([cell.text.strip() for cell in cells])
+    # Date and Close come back typed and sorted by date
+    df = price_store.load_prices(selected_url)
+    if not df.empty:
+        # Display the last 5 rows
+        st.table(price_store.latest_rows(selected_url, columns))
 
-                        if data:
-                            # Convert to DataFrame
-                            df = pd.DataFrame(data, columns=headers)
+        # Create a stock price chart, downsampled so the trend shape survives
+        fig = downsample.line_chart(df, "Date", "Close", f"{stock_name} Closing Price Trend",
+                                    budget=chart_points)
+        st.plotly_chart(fig)
+    else:
+        st.warning("No data found in the table.")
 
-                            # Convert first column to datetime format
-                            if "Date" in df.columns:
-                                df["Date"] = pd.to_datetime(df["Date"], errors='coerce')
-                                df = df.dropna().sort_values(by="Date", ascending=True)
+    if st.button("Stop Tracking"):
+        scheduler.untrack(selected_url)
+        my_sheets.remove(selected_url)
+        st.rerun()
 
-                            # Convert relevant columns to numeric
-                            if "Close" in df.columns:
-                                df["Close"] = pd.to_numeric(df["Close"], errors='coerce')
-                                df = df.dropna()
+# Batch mode: load a whole portfolio of sheets at once
+st.subheader("Batch")
+batch_text = st.text_area("Google Sheet URLs, one per line", "")
 
-                            # Display the last 5 rows
-                            st.table(df.tail(5))
+if st.button("Fetch Batch"):
+    batch_urls = [line.strip() for line in batch_text.splitlines() if line.strip()]
+    if not batch_urls:
+        st.error("Please enter at least one Google Sheet URL.")
+    else:
+        # Downloads run concurrently and parsing happens in worker processes
+        st.session_state['batch_result'] = sheet_batch.fetch_batch(batch_urls)
 
-                            # Create a stock price chart
-                            fig = px.line(df, x="Date", y="Close", title=f"{stock_name} Closing Price Trend")
-                            st.plotly_chart(fig)
-                        else:
-                            st.warning("No data found in the table.")
-                    else:
-                        st.warning("No rows found in the table.")
-                else:
-                    st.warning("No table found on the page. Google Sheets may not be scrapable due to dynamic content loading.")
-        except Exception as e:
-            st.error(f"An error occurred: {e}")
\ No newline at end of file
+batch = st.session_state.get('batch_result')
+if batch is not None:
+    # A failing sheet is reported without hiding the ones that loaded
+    for url, message in batch.errors.items():
+        st.error(f"{url}: {message}")
+    if not batch.frame.empty:
+        st.write(f"Loaded {len(batch.sheets)} sheets, {len(batch.frame)} rows.")
+        fig = downsample.multi_line_chart(batch.frame, "Date", "Close", "Symbol",
+                                          "Closing Price Trends", budget=chart_points)
+        st.plotly_chart(fig)